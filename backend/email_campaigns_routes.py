@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 import uuid
 import jwt
 import os
+import re
 from motor.motor_asyncio import AsyncIOMotorClient
 
 router = APIRouter(prefix="/api/email-campaigns", tags=["Email Campaigns"])
@@ -79,6 +80,10 @@ class RecipientAdd(BaseModel):
     variables: dict = {}  # Variable values for template
 
 
+class BulkDeleteRequest(BaseModel):
+    name_prefix: str
+
+
 # ============== TEMPLATES ==============
 
 @router.get("/templates")
@@ -159,6 +164,19 @@ async def delete_template(template_id: str, current_user: dict = Depends(get_cur
     return {"success": True, "message": "Template deleted"}
 
 
+@router.post("/templates/bulk-delete")
+async def bulk_delete_templates(data: BulkDeleteRequest, current_user: dict = Depends(get_current_user)):
+    """Delete every template in the organization whose name starts with name_prefix"""
+    if not data.name_prefix:
+        raise HTTPException(status_code=400, detail="name_prefix is required")
+    org_id = current_user.get("org_id")
+    result = await templates_col.update_many(
+        {"org_id": org_id, "deleted": {"$ne": True}, "name": {"$regex": f"^{re.escape(data.name_prefix)}"}},
+        {"$set": {"deleted": True, "deleted_at": datetime.now(timezone.utc).isoformat()}}
+    )
+    return {"success": True, "deleted": result.modified_count}
+
+
 # ============== CAMPAIGNS ==============
 
 @router.get("/campaigns")
@@ -7,6 +7,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone
 from typing import Optional, List
 import os
+import re
 from uuid import uuid4
 
 from parties_models import (
@@ -40,6 +41,7 @@ db = client[DB_NAME]
 async def get_customers(
     org_id: Optional[str] = Depends(get_org_scope),
     search: Optional[str] = None,
+    prefix: Optional[str] = None,
     status: Optional[str] = None,
     customer_type: Optional[str] = None
 ):
@@ -54,6 +56,10 @@ async def get_customers(
                 {"customer_id": {"$regex": search, "$options": "i"}}
             ]
         
+        if prefix:
+            # Anchored, case-sensitive name match, e.g. prefix=TEST_
+            query["display_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
         if status:
             query["status"] = status
         
@@ -174,6 +180,7 @@ async def delete_customer(
 async def get_vendors(
     org_id: Optional[str] = Depends(get_org_scope),
     search: Optional[str] = None,
+    prefix: Optional[str] = None,
     status: Optional[str] = None,
     vendor_type: Optional[str] = None
 ):
@@ -188,6 +195,9 @@ async def get_vendors(
                 {"vendor_id": {"$regex": search, "$options": "i"}}
             ]
         
+        if prefix:
+            query["display_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
         if status:
             query["status"] = status
         
@@ -233,6 +243,7 @@ async def create_vendor(
 async def get_partners(
     org_id: Optional[str] = Depends(get_org_scope),
     search: Optional[str] = None,
+    prefix: Optional[str] = None,
     status: Optional[str] = None,
     partner_type: Optional[str] = None
 ):
@@ -247,6 +258,9 @@ async def get_partners(
                 {"partner_id": {"$regex": search, "$options": "i"}}
             ]
         
+        if prefix:
+            query["display_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
         if status:
             query["status"] = status
             
@@ -328,7 +342,7 @@ async def update_partner(
         
         await db.partners.update_one(query, {"$set": update_data})
         
-        return {"success": True, "message": "Partner updated successfully"}
+        return {"success": True, "message": "Partner updated successfully", "partner": {**existing, **update_data}}
     except HTTPException:
         raise
     except Exception as e:
@@ -361,6 +375,7 @@ async def delete_partner(
 async def get_channels(
     org_id: Optional[str] = Depends(get_org_scope),
     search: Optional[str] = None,
+    prefix: Optional[str] = None,
     status: Optional[str] = None,
     channel_type: Optional[str] = None
 ):
@@ -374,6 +389,9 @@ async def get_channels(
                 {"channel_id": {"$regex": search, "$options": "i"}}
             ]
         
+        if prefix:
+            query["channel_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
         if status:
             query["status"] = status
             
@@ -452,7 +470,7 @@ async def update_channel(
         
         await db.channels.update_one(query, {"$set": update_data})
         
-        return {"success": True, "message": "Channel updated successfully"}
+        return {"success": True, "message": "Channel updated successfully", "channel": {**existing, **update_data}}
     except HTTPException:
         raise
     except Exception as e:
@@ -485,6 +503,7 @@ async def delete_channel(
 async def get_profiles(
     org_id: Optional[str] = Depends(get_org_scope),
     search: Optional[str] = None,
+    prefix: Optional[str] = None,
     profile_type: Optional[str] = None,
     status: Optional[str] = None
 ):
@@ -498,6 +517,9 @@ async def get_profiles(
                 {"profile_id": {"$regex": search, "$options": "i"}}
             ]
         
+        if prefix:
+            query["profile_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
         if profile_type:
             query["profile_type"] = profile_type
             
@@ -576,7 +598,7 @@ async def update_profile(
         
         await db.profiles.update_one(query, {"$set": update_data})
         
-        return {"success": True, "message": "Profile updated successfully"}
+        return {"success": True, "message": "Profile updated successfully", "profile": {**existing, **update_data}}
     except HTTPException:
         raise
     except Exception as e:
@@ -783,7 +805,7 @@ async def bulk_create_vendors(
                     "created_at": datetime.now(timezone.utc)
                 })
                 
-                await db.vendors.insert_one(vendor_doc)
+                await db.parties_vendors.insert_one(vendor_doc)
                 created.append(vendor_id)
             except Exception as e:
                 errors.append({"index": idx, "error": str(e)})
@@ -806,8 +828,8 @@ async def bulk_delete_parties(
     """Bulk delete parties"""
     try:
         collection_map = {
-            "customers": ("customers", "customer_id"),
-            "vendors": ("vendors", "vendor_id"),
+            "customers": ("parties_customers", "customer_id"),
+            "vendors": ("parties_vendors", "vendor_id"),
             "partners": ("partners", "partner_id"),
             "channels": ("channels", "channel_id"),
             "profiles": ("profiles", "profile_id")
@@ -78,6 +78,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses (list endpoints such as audit logs) for
+# clients that send Accept-Encoding: gzip, as browsers and requests do
+from fastapi.middleware.gzip import GZipMiddleware
+
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
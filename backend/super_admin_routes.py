@@ -7,6 +7,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 from passlib.context import CryptContext
+import re
 import uuid
 import json
 import asyncio
@@ -163,9 +164,13 @@ async def verify_super_admin(current_user: dict = Depends(get_current_user_enter
 # ==================== ORGANIZATION ENDPOINTS ====================
 
 @router.get("/organizations")
-async def list_organizations(current_user: dict = Depends(verify_super_admin)):
+async def list_organizations(prefix: Optional[str] = None, current_user: dict = Depends(verify_super_admin)):
     """List all organizations (Super Admin only)"""
-    orgs = await db.organizations.find({}).to_list(1000)
+    query = {}
+    if prefix:
+        # Anchored, case-sensitive name match, e.g. prefix=TEST_
+        query["name"] = {"$regex": f"^{re.escape(prefix)}"}
+    orgs = await db.organizations.find(query).to_list(1000)
     
     # Get user counts for each org
     for org in orgs:
@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 import uuid
 import jwt
 import os
+import re
 from motor.motor_asyncio import AsyncIOMotorClient
 
 router = APIRouter(prefix="/api/workflows", tags=["Workflow Builder"])
@@ -82,6 +83,10 @@ class WorkflowCreate(BaseModel):
     is_active: bool = False
 
 
+class BulkDeleteRequest(BaseModel):
+    name_prefix: str
+
+
 # ============== WORKFLOW CRUD ==============
 
 @router.get("/list")
@@ -179,6 +184,19 @@ async def delete_workflow(workflow_id: str, current_user: dict = Depends(get_cur
     return {"success": True, "message": "Workflow deleted"}
 
 
+@router.post("/bulk-delete")
+async def bulk_delete_workflows(data: BulkDeleteRequest, current_user: dict = Depends(get_current_user)):
+    """Delete every workflow in the organization whose name starts with name_prefix"""
+    if not data.name_prefix:
+        raise HTTPException(status_code=400, detail="name_prefix is required")
+    org_id = current_user.get("org_id")
+    result = await workflows_col.update_many(
+        {"org_id": org_id, "deleted": {"$ne": True}, "name": {"$regex": f"^{re.escape(data.name_prefix)}"}},
+        {"$set": {"deleted": True, "deleted_at": datetime.now(timezone.utc).isoformat(), "is_active": False}}
+    )
+    return {"success": True, "deleted": result.modified_count}
+
+
 @router.post("/{workflow_id}/toggle")
 async def toggle_workflow(workflow_id: str, current_user: dict = Depends(get_current_user)):
     """Toggle workflow active status"""
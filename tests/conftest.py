@@ -0,0 +1,504 @@
+"""
+Shared pytest configuration for the API test suite
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from tests.local_backend import ASGIBackend, LocalPartiesBackend
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Test credentials
+TEST_EMAIL = "demo@innovatebooks.com"
+TEST_PASSWORD = "Demo1234"
+
+# Super admin credentials, checked by enterprise auth
+SUPER_ADMIN_EMAIL = "revanth@innovatebooks.in"
+SUPER_ADMIN_PASSWORD = "Pandu@1605"
+
+# Host used by the in-process local lane, which ignores it
+LOCAL_BASE_URL = "http://localhost"
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+# Seconds to wait on the one-off /api/health probe
+HEALTH_TIMEOUT = 2
+
+# Keep-alive connections held open per host by the shared session. The host
+# is resolved only when one of them is opened, so there is no DNS cache or
+# IP pinning on top; pinning would also break TLS SNI and host routing on
+# the hosted backend.
+HTTP_POOL_MAXSIZE = 16
+
+# (connect, read) timeout for calls on the shared transport that don't pass
+# one, so a stalled backend fails the test instead of hanging the worker
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Retry transient gateway errors and dropped connections on the pooled
+# connection instead of failing the test. urllib3's default allowed methods
+# are the idempotent ones, so a POST is never sent twice; the last response
+# is returned rather than raised so assertions still see it.
+HTTP_RETRY = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+
+# Threads used to overlap independent requests; below the pool size so
+# concurrent calls never wait on a connection
+PARALLEL_WORKERS = 8
+
+# pytest cache key holding the last known runtime of each test
+DURATIONS_CACHE_KEY = "innovatebooks/durations"
+
+# Call-phase runtimes observed during this session, keyed by node id
+_durations = {}
+
+
+@lru_cache(maxsize=None)
+def run_id():
+    """Identifier for this run's TEST_ entity names, unique per xdist worker
+    and per run, so a cleanup scoped to it never deletes what another worker
+    or a concurrent run is still testing
+
+    Set TEST_RUN_ID to reuse one across runs, e.g. to sweep what an aborted
+    run left behind; pytest_configure sets it when replaying a --cassette,
+    so call this from test modules, not at conftest import.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"{worker}_{os.environ.get('TEST_RUN_ID') or uuid4().hex[:6]}"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--slowest-first",
+        action="store_true",
+        default=False,
+        help="Run tests in descending order of their last recorded runtime",
+    )
+    parser.addoption(
+        "--smoke",
+        action="store_true",
+        default=False,
+        help="Fast lane: deselect tests marked slow",
+    )
+    parser.addoption(
+        "--cassette",
+        default=None,
+        metavar="PATH",
+        help="Replay HTTP responses recorded in PATH; if PATH does not exist, "
+             "run against the live backend and record them there",
+    )
+    parser.addoption(
+        "--remote",
+        action="store_true",
+        default=False,
+        help="Run modules that default to an in-process backend (the local "
+             "lane) against the live backend instead",
+    )
+    parser.addoption(
+        "--asgi",
+        action="store_true",
+        default=False,
+        help="Run modules that support it against the backend routers "
+             "in-process, over ASGI, instead of the live backend",
+    )
+    parser.addoption(
+        "--deactivate-test-orgs",
+        action="store_true",
+        default=False,
+        help="Have the super admin cleanup deactivate the TEST_ organizations "
+             "it finds instead of only reporting them",
+    )
+    parser.addoption(
+        "--thorough",
+        action="store_true",
+        default=False,
+        help="Re-read entities after PUT/DELETE instead of trusting the "
+             "mutation response",
+    )
+
+
+def pytest_configure(config):
+    """With --cassette, pin TEST_RUN_ID (the TEST_ name suffix) to the one
+    stored in the cassette, or pick the one a new recording will store
+
+    A cassette is one file holding one ordered stream of interactions, so
+    it cannot be combined with pytest-xdist: every worker would record its
+    own share to the same PATH, the last one to finish overwriting the
+    rest, and a replay would hand each worker interactions another worker
+    made.
+    """
+    path = config.getoption("--cassette")
+    if path is None:
+        return
+    if config.getoption("numprocesses", default=None):
+        raise pytest.UsageError("--cassette cannot be combined with pytest-xdist (-n); run it without -n")
+    run_id = CassetteAdapter.load(path)["run_id"] if os.path.exists(path) else uuid4().hex[:6]
+    os.environ["TEST_RUN_ID"] = run_id
+
+
+def pytest_runtest_logreport(report):
+    """Record how long each test's call phase took"""
+    if report.when == "call":
+        _durations[report.nodeid] = report.duration
+
+
+def _deselect_slow(config, items):
+    """Drop slow-marked tests from the run when --smoke is given"""
+    if not config.getoption("--smoke"):
+        return
+    selected = [item for item in items if item.get_closest_marker("slow") is None]
+    deselected = [item for item in items if item.get_closest_marker("slow") is not None]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_collection_modifyitems(config, items):
+    """Apply --smoke, then with --slowest-first start the slowest modules
+    first so they don't become stragglers under xdist
+
+    Modules are ordered by the total last known runtime of their tests.
+    Tests keep their order inside a module, so module-scoped fixtures are
+    set up once and cleanup classes still run after the tests whose data
+    they remove.
+    """
+    _deselect_slow(config, items)
+    # config.cache is missing altogether with -p no:cacheprovider
+    cache = getattr(config, "cache", None)
+    if not config.getoption("--slowest-first") or cache is None:
+        return
+    durations = cache.get(DURATIONS_CACHE_KEY, {})
+    module_totals = defaultdict(float)
+    for item in items:
+        module_totals[item.path] += durations.get(item.nodeid, 0.0)
+
+    # A stable sort on the module total alone keeps each module contiguous
+    # and in collection order
+    items.sort(key=lambda item: -module_totals[item.path])
+
+
+def pytest_sessionfinish(session):
+    cache = getattr(session.config, "cache", None)
+    if cache is None or not _durations:
+        return
+    durations = cache.get(DURATIONS_CACHE_KEY, {})
+    durations.update(_durations)
+    cache.set(DURATIONS_CACHE_KEY, durations)
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter applying REQUEST_TIMEOUT to calls made without a timeout"""
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=REQUEST_TIMEOUT if timeout is None else timeout, **kwargs)
+
+
+class CassetteAdapter(PooledAdapter):
+    """Transport adapter that records live responses to a JSON cassette, or
+    replays a previously recorded one without touching the network
+
+    Interactions are keyed by method and URL path, and replayed in recorded
+    order, so the same GET can answer 200 before a DELETE and 404 after it.
+    Each also stores a digest of its request body; a replayed request takes
+    the first interaction whose digest matches, so concurrent creates on one
+    path get back their own responses whatever order the threads run in.
+    Server-generated ids need no normalising: replayed create responses hand
+    back the recorded ids, which the following requests then use. Only the
+    response status, content type and body are stored; request headers
+    (including Authorization) never reach the cassette.
+
+    The cassette also keeps the TEST_RUN_ID used while recording, which
+    pytest_configure restores on replay so generated TEST_ names match.
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.replaying = os.path.exists(path)
+        self.recorded = []
+        self.interactions = defaultdict(deque)
+        self.lock = threading.Lock()
+        if self.replaying:
+            for interaction in self.load(path)["interactions"]:
+                key = (interaction["method"], interaction["url"])
+                self.interactions[key].append(interaction)
+
+    @staticmethod
+    def load(path):
+        with open(path, encoding="utf-8") as cassette:
+            return json.load(cassette)
+
+    @staticmethod
+    def _key(request):
+        url = urlsplit(request.url)
+        path = f"{url.path}?{url.query}" if url.query else url.path
+        return request.method, path
+
+    @staticmethod
+    def _digest(request):
+        body = request.body or b""
+        return hashlib.sha1(body.encode("utf-8") if isinstance(body, str) else body).hexdigest()
+
+    def send(self, request, **kwargs):
+        method, path = self._key(request)
+        if self.replaying:
+            return self._replay(request, self._take(method, path, self._digest(request)))
+        response = super().send(request, **kwargs)
+        self.recorded.append({
+            "method": method,
+            "url": path,
+            "body_sha1": self._digest(request),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "body": response.content.decode("utf-8", errors="replace"),
+        })
+        return response
+
+    def _take(self, method, path, digest):
+        """Pop the first recorded interaction for method and path with a
+        matching body digest, else the first one (cassettes recorded without
+        digests, or bodies that differ between runs)"""
+        with self.lock:
+            recorded = self.interactions[(method, path)]
+            if not recorded:
+                raise requests.ConnectionError(f"No recorded response for {method} {path}")
+            interaction = next((i for i in recorded if i.get("body_sha1") == digest), recorded[0])
+            recorded.remove(interaction)
+            return interaction
+
+    @staticmethod
+    def _replay(request, interaction):
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": interaction["content_type"]})
+        response._content = interaction["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def save(self):
+        if self.replaying:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as cassette:
+            json.dump({"run_id": os.environ.get("TEST_RUN_ID"), "interactions": self.recorded}, cassette, indent=1)
+
+
+@pytest.fixture(scope="session")
+def live_backend():
+    """Probe the backend once per session
+
+    A failed probe is cached with the fixture, so every test that needs the
+    live backend is skipped straight away instead of each waiting out its
+    own connection timeout.
+    """
+    try:
+        requests.get(f"{BASE_URL}/api/health", timeout=HEALTH_TIMEOUT)
+    except requests.RequestException as exc:
+        pytest.skip(f"Backend unreachable: {exc}")
+
+
+@pytest.fixture(scope="session")
+def http_adapter(request):
+    """Transport shared by the session fixtures: pooled connections with
+    retries and a default timeout, or a cassette when --cassette is given"""
+    path = request.config.getoption("--cassette")
+    if path is None:
+        request.getfixturevalue("live_backend")
+        yield PooledAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=HTTP_RETRY)
+        return
+    adapter = CassetteAdapter(path, pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=HTTP_RETRY)
+    if not adapter.replaying:
+        request.getfixturevalue("live_backend")
+    yield adapter
+    adapter.save()
+
+
+def _parse_json_once(response, *args, **kwargs):
+    """Response hook: decode the body on the first .json() call only, with
+    orjson when it is installed, and hand back the same object afterwards"""
+    decode = response.json
+    parsed = []
+
+    def json(**kwargs):
+        if not parsed:
+            parsed.append(orjson.loads(response.content) if orjson and not kwargs else decode(**kwargs))
+        return parsed[0]
+
+    response.json = json
+    return response
+
+
+def _reject_auth_errors(response, *args, **kwargs):
+    """Response hook for logged-in sessions: a 401 or 403 means the token
+    itself was refused, so fail there, naming the request, rather than
+    leave each test to report an unexpected status"""
+    if response.status_code in (401, 403):
+        raise AssertionError(
+            f"{response.request.method} {response.request.url} refused the session's token: "
+            f"{response.status_code} {response.text[:500]}"
+        )
+    return response
+
+
+def _mounted_session(adapter):
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.hooks["response"].append(_parse_json_once)
+    return session
+
+
+@pytest.fixture(scope="session")
+def http_unauth(http_adapter):
+    """Session without credentials, for login and auth-required checks"""
+    session = _mounted_session(http_adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def auth_headers(http_adapter):
+    """Log in once per session and share the auth headers across test files
+
+    Modules that define their own auth_headers fixture override this one.
+    """
+    # A private session, so modules overriding http_unauth don't change how
+    # this session-wide login is made
+    response = _mounted_session(http_adapter).post(
+        f"{BASE_URL}/api/auth/login",
+        json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    # The backend is known to be up, so a failed login is a real failure
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    data = response.json()
+    token = data.get("access_token") or data.get("token")
+    # Read-only, so no test can change the headers every other test shares;
+    # build {**auth_headers, ...} for a different Content-Type
+    return MappingProxyType({"Authorization": f"Bearer {token}", "Content-Type": "application/json"})
+
+
+@pytest.fixture(scope="session")
+def http(http_adapter, auth_headers):
+    """Authenticated requests.Session reusing pooled keep-alive connections
+
+    Modules that define their own http fixture override this one.
+    """
+    session = _mounted_session(http_adapter)
+    session.headers.update(auth_headers)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def super_admin_token(http_adapter):
+    """Log the super admin in through enterprise auth once per session
+
+    A failed login skips every test that needs the token; the skip is
+    cached with the fixture, so the login is not retried test by test.
+    """
+    response = _mounted_session(http_adapter).post(
+        f"{BASE_URL}/api/enterprise/auth/login",
+        json={"email": SUPER_ADMIN_EMAIL, "password": SUPER_ADMIN_PASSWORD}
+    )
+    if response.status_code != 200:
+        pytest.skip(f"Super admin authentication failed: {response.text}")
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="session")
+def super_admin_http(http_adapter, super_admin_token):
+    """Super admin session on the shared transport, with the Authorization
+    and Content-Type headers set so calls don't pass headers
+
+    Any 401/403 on it fails the test at once, since the super admin can
+    reach every endpoint; unauthenticated checks use http_unauth.
+    """
+    session = _mounted_session(http_adapter)
+    session.headers.update({
+        "Authorization": f"Bearer {super_admin_token}",
+        "Content-Type": "application/json",
+    })
+    session.hooks["response"].append(_reject_auth_errors)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def parallel():
+    """Map a request function over arguments concurrently, returning results
+    in argument order, e.g. ``parallel(http.get, urls)``
+
+    requests releases the GIL while waiting on the socket, so independent
+    calls overlap and cost roughly the slowest one instead of the sum.
+    """
+    with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+        def run(fn, *iterables):
+            return list(executor.map(fn, *iterables))
+        yield run
+
+
+@pytest.fixture(scope="session")
+def local_http_unauth():
+    """Session served by the in-process parties backend, without credentials"""
+    session = _mounted_session(LocalPartiesBackend())
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def local_http(local_http_unauth):
+    """Authenticated session against the in-process parties backend"""
+    response = local_http_unauth.post(
+        f"{LOCAL_BASE_URL}/api/auth/login",
+        json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    session = _mounted_session(local_http_unauth.get_adapter(LOCAL_BASE_URL))
+    session.headers.update({
+        "Authorization": f"Bearer {response.json()['access_token']}",
+        "Content-Type": "application/json",
+    })
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def asgi_engines_http():
+    """Session served in-process by the parties and governance engine
+    routers, which need no credentials
+
+    Only the routers are mounted, under /api as the tests address them, so
+    the rest of server.py is never imported. They still read and write the
+    MongoDB at MONGO_URL.
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from fastapi import FastAPI
+    import governance_engine_routes
+    import parties_engine_routes
+
+    app = FastAPI()
+    for module in (parties_engine_routes, governance_engine_routes):
+        app.include_router(module.router, prefix="/api")
+    session = _mounted_session(ASGIBackend(app))
+    yield session
+    session.close()
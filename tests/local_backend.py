@@ -0,0 +1,155 @@
+"""
+In-process transports for tests that don't need the live backend
+
+LocalPartiesBackend is a stand-in for the login and IB Commerce parties
+endpoints. Mounted on a requests.Session as a transport adapter, it answers
+the partners/channels/profiles CRUD routes from memory with the same
+response shapes as backend/parties_routes.py, so the parties tests can run
+with no backend or network. Pass --remote to run them against the live
+backend.
+
+ASGIBackend instead dispatches to real backend routers in-process, so the
+routes run unchanged against their database with no HTTP server in between.
+"""
+import json
+import re
+from urllib.parse import parse_qsl, urlsplit
+from uuid import uuid4
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+PARTIES_PATH = "/api/commerce/parties/"
+
+# Per resource: response key, id prefix, and the fields ?search= matches;
+# the first is the name field ?prefix= matches
+PARTY_RESOURCES = {
+    "partners": ("partner", "PART", ("display_name", "legal_name", "partner_id")),
+    "channels": ("channel", "CHAN", ("channel_name", "channel_id")),
+    "profiles": ("profile", "PROF", ("profile_name", "profile_id")),
+}
+
+
+class LocalPartiesBackend(BaseAdapter):
+    """Transport adapter serving login and parties CRUD from memory"""
+
+    def __init__(self):
+        super().__init__()
+        self.store = {resource: {} for resource in PARTY_RESOURCES}
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        body = json.loads(request.body) if request.body else {}
+        if url.path == "/api/auth/login" and request.method == "POST":
+            status, payload = 200, {"access_token": f"local-{uuid4().hex}", "token_type": "bearer"}
+        elif url.path.startswith(PARTIES_PATH):
+            status, payload = self._parties(request, url, body)
+        else:
+            status, payload = 404, {"detail": "Not Found"}
+        return self._response(request, status, payload)
+
+    def close(self):
+        pass
+
+    def _parties(self, request, url, body):
+        if not request.headers.get("Authorization"):
+            return 403, {"detail": "Not authenticated"}
+        resource, _, entity_id = url.path[len(PARTIES_PATH):].partition("/")
+        if resource not in PARTY_RESOURCES:
+            return 404, {"detail": "Not Found"}
+        key, prefix, search_fields = PARTY_RESOURCES[resource]
+        entities = self.store[resource]
+        title = key.capitalize()
+
+        if not entity_id:
+            if request.method == "GET":
+                params = dict(parse_qsl(url.query))
+                search = params.pop("search", None)
+                prefix = params.pop("prefix", None)
+                found = [
+                    entity for entity in reversed(list(entities.values()))
+                    if all(entity.get(field) == value for field, value in params.items())
+                    and (search is None or any(
+                        re.search(search, str(entity.get(field, "")), re.I) for field in search_fields
+                    ))
+                    and (prefix is None or str(entity.get(search_fields[0], "")).startswith(prefix))
+                ]
+                return 200, {"success": True, resource: found, "count": len(found)}
+            if request.method == "POST":
+                entity = {**body, f"{key}_id": f"{prefix}-{uuid4().hex[:8].upper()}"}
+                entities[entity[f"{key}_id"]] = entity
+                return 200, {"success": True, "message": f"{title} created successfully", key: entity}
+            return 405, {"detail": "Method Not Allowed"}
+
+        if entity_id not in entities:
+            return 404, {"detail": f"{title} not found"}
+        if request.method == "GET":
+            return 200, {"success": True, key: entities[entity_id]}
+        if request.method == "PUT":
+            entities[entity_id] = {**entities[entity_id], **body}
+            return 200, {"success": True, "message": f"{title} updated successfully", key: entities[entity_id]}
+        if request.method == "DELETE":
+            del entities[entity_id]
+            return 200, {"success": True, "message": f"{title} deleted successfully"}
+        return 405, {"detail": "Method Not Allowed"}
+
+    @staticmethod
+    def _response(request, status, payload):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps(payload).encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class ASGIBackend(BaseAdapter):
+    """Transport adapter handing requests to an ASGI app in-process
+
+    Requests go through starlette's TestClient, so the app's routing,
+    validation and serialisation all run but no socket is opened; the host
+    in the URL is ignored. The client is entered for the adapter's lifetime,
+    so every request runs on the one event loop; Motor binds to the first
+    loop it is used on, and a fresh loop per request fails with "Event loop
+    is closed" from the second request on.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+        # Imported here, not at module level: conftest.py imports this module
+        # on every run, and importing starlette's test client emits an anyio
+        # DeprecationWarning even when no test uses --asgi
+        from starlette.testclient import TestClient
+
+        self.client = TestClient(app)
+        self.client.__enter__()
+
+    def send(self, request, **kwargs):
+        served = self.client.request(
+            request.method, request.url, content=request.body, headers=dict(request.headers)
+        )
+        response = requests.Response()
+        response.status_code = served.status_code
+        response.headers = CaseInsensitiveDict(served.headers)
+        response._content = served.content
+        response.encoding = served.encoding
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        # Sessions close every mounted adapter, and this one is mounted for
+        # both http:// and https://
+        if self.client is not None:
+            self.client.__exit__(None, None, None)
+            self.client = None
+
+
+def select_lane(request, name):
+    """Return the live fixture `name` with --remote, else its local_ counterpart"""
+    if request.config.getoption("--remote"):
+        return request.getfixturevalue(name)
+    return request.getfixturevalue(f"local_{name}")
@@ -3,53 +3,152 @@ Test P2 Features: ML Bank Reconciliation and Cap Table Scenario Modeling
 Tests all API endpoints for:
 1. ML-powered bank reconciliation with auto-suggestions
 2. Cap Table Scenario Modeling with dilution analysis
+Request-validation-only checks run in-process in tests/unit/.
+
+Calls go through the shared http and http_unauth sessions from
+conftest.py, so they get its pooled connections, retries, default
+timeout and --cassette replay.
+
+Scenario names start with TEST_<RUN_ID>_, and each xdist worker deletes
+only its own at module teardown, so workers and concurrent runs never
+delete scenarios another one is still using.
 """
 
 import pytest
-import requests
+import itertools
+import logging
+import math
 import os
-import uuid
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from tests.conftest import run_id
+
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
-# Test credentials
-TEST_EMAIL = "demo@innovatebooks.com"
-TEST_PASSWORD = "Demo1234"
+# Progress output; shown with --log-cli-level=INFO
+logger = logging.getLogger(__name__)
 
+# Endpoint roots
+ML = f"{BASE_URL}/api/ib-finance/ml-reconcile"
+CAP = f"{BASE_URL}/api/ib-capital/scenario"
 
-class TestAuth:
-    """Authentication helper"""
-    
-    @staticmethod
-    def get_auth_token():
-        """Get authentication token"""
-        response = requests.post(f"{BASE_URL}/api/auth/login", json={
-            "email": TEST_EMAIL,
-            "password": TEST_PASSWORD,
-            "remember_me": True
-        })
-        if response.status_code == 200:
-            return response.json().get("access_token")
-        return None
+# Endpoints that must reject unauthenticated requests (scenario templates are public)
+AUTH_REQUIRED_ENDPOINTS = [
+    ("POST", f"{ML}/auto-match"),
+    ("GET", f"{ML}/suggestions/test"),
+    ("POST", f"{ML}/confirm-match"),
+    ("GET", f"{CAP}/list"),
+    ("POST", f"{CAP}/create"),
+    ("GET", f"{CAP}/test-id"),
+    ("POST", f"{CAP}/round/add"),
+    ("POST", f"{CAP}/simulate-quick"),
+    ("POST", f"{CAP}/analyze"),
+]
+
+# Follows "TEST_" in every TEST_ scenario name; unique per xdist worker and per run
+RUN_ID = run_id()
+
+# Names the module teardown deletes: this worker's and this run's own
+CLEANUP_PREFIX = f"TEST_{RUN_ID}_"
+
+# Quick simulation: 10M pre-money, 2M investment, no option pool increase
+QUICK_SIM_SHARES = 10_000_000
+QUICK_SIM_PRE_MONEY = 10_000_000
+QUICK_SIM_INVESTMENT = 2_000_000
+EXPECTED_POST_MONEY = QUICK_SIM_PRE_MONEY + QUICK_SIM_INVESTMENT
+EXPECTED_NEW_INV_PCT = 100 * QUICK_SIM_INVESTMENT / EXPECTED_POST_MONEY
+EXPECTED_EXISTING_PCT = 100 - EXPECTED_NEW_INV_PCT
+# The API rounds percentages to two decimals
+PCT_ABS_TOL = 0.01
+
+# Scenarios provisioned up-front for tests that need an existing scenario
+SCENARIO_POOL_SIZE = 4
+
+
+def ok_json(response, expected=200):
+    """Assert the status code and return the parsed body (parsed once)"""
+    assert response.status_code == expected, f"Expected {expected}, got {response.status_code}: {response.text}"
+    return response.json()
 
 
 @pytest.fixture(scope="module")
-def auth_token():
-    """Get auth token for all tests"""
-    token = TestAuth.get_auth_token()
-    if not token:
-        pytest.skip("Authentication failed - skipping tests")
-    return token
+def auto_match_response(http):
+    """POST /api/ib-finance/ml-reconcile/auto-match once and share the parsed body"""
+    response = http.post(f"{ML}/auto-match")
+    # Should return 200 even if no data to match
+    return ok_json(response)
 
 
 @pytest.fixture(scope="module")
-def auth_headers(auth_token):
-    """Get auth headers for all tests"""
-    return {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json"
-    }
+def scenario_templates(http_unauth):
+    """Fetch the static scenario templates once, without a token (the endpoint is public)"""
+    response = http_unauth.get(f"{CAP}/templates")
+    assert response.status_code == 200, "Templates endpoint should be public"
+    data = response.json()
+    assert "templates" in data, "Response should contain 'templates'"
+    return data["templates"]
+
+
+@pytest.fixture(scope="session")
+def scenario_name():
+    """Build unique TEST_<RUN_ID>_<kind>_<n> scenario names from a counter"""
+    counter = itertools.count()
+    return lambda kind: f"{CLEANUP_PREFIX}{kind}_{next(counter):04d}"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cleanup_test_scenarios(http, parallel):
+    """Delete this worker's TEST_<RUN_ID>_ scenarios after the module
+
+    A fixture rather than a last test, so it runs on every worker that ran
+    tests from the module, whichever way xdist distributed them.
+    """
+    yield
+    response = http.get(f"{CAP}/list")
+    if response.status_code == 200:
+        scenario_ids = [
+            scenario["scenario_id"] for scenario in response.json().get("scenarios", [])
+            if scenario.get("name", "").startswith(CLEANUP_PREFIX)
+        ]
+        statuses = parallel(lambda scenario_id: http.delete(f"{CAP}/{scenario_id}").status_code, scenario_ids)
+        logger.info("✓ Cleaned up %s test scenarios", statuses.count(200))
+
+
+@pytest.fixture(scope="module")
+def scenario_pool(http, scenario_name):
+    """Create a few scenarios once and hand them out via a queue
+
+    Each test that needs an existing scenario takes its own with
+    scenario_pool.get_nowait(); all of them are deleted at teardown.
+    """
+    def create_scenario(name):
+        response = http.post(
+            f"{CAP}/create",
+            json={
+                "name": name,
+                "description": "Pooled test scenario",
+                "base_valuation": 10000000,
+                "base_shares_outstanding": 10000000
+            }
+        )
+        return ok_json(response)
+
+    names = [scenario_name("Pool") for _ in range(SCENARIO_POOL_SIZE)]
+    with ThreadPoolExecutor(max_workers=SCENARIO_POOL_SIZE) as executor:
+        scenarios = list(executor.map(create_scenario, names))
+
+    pool = queue.Queue()
+    for scenario in scenarios:
+        pool.put(scenario)
+    yield pool
+
+    def delete_scenario(scenario):
+        http.delete(f"{CAP}/{scenario['scenario_id']}")
+
+    with ThreadPoolExecutor(max_workers=SCENARIO_POOL_SIZE) as executor:
+        list(executor.map(delete_scenario, scenarios))
 
 
 # ============== ML BANK RECONCILIATION TESTS ==============
@@ -57,67 +156,38 @@ def auth_headers(auth_token):
 class TestMLBankReconciliation:
     """Test ML-powered bank reconciliation APIs"""
     
-    def test_ml_auto_match_endpoint_exists(self, auth_headers):
-        """Test POST /api/ib-finance/ml-reconcile/auto-match endpoint exists"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/auto-match",
-            headers=auth_headers
-        )
-        # Should return 200 even if no data to match
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
-        assert "success" in data or "message" in data or "total_analyzed" in data
-        print(f"✓ ML auto-match endpoint works: {data.get('message', data)}")
-    
-    def test_ml_auto_match_returns_expected_fields(self, auth_headers):
-        """Test ML auto-match returns expected response structure"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/auto-match",
-            headers=auth_headers
-        )
-        assert response.status_code == 200
-        data = response.json()
-        
-        # Check expected fields
-        expected_fields = ["success", "message", "total_analyzed", "auto_matched", "pending_review"]
-        for field in expected_fields:
-            if field in data:
-                print(f"✓ Field '{field}' present: {data[field]}")
-        
-        # Verify all_matches is a list if present
-        if "all_matches" in data:
-            assert isinstance(data["all_matches"], list), "all_matches should be a list"
-            print(f"✓ all_matches is a list with {len(data['all_matches'])} items")
+    @pytest.mark.parametrize("check", ["status", "fields", "all_matches_list"])
+    def test_ml_auto_match(self, auto_match_response, check):
+        """Test POST /api/ib-finance/ml-reconcile/auto-match response (one shared call)"""
+        data = auto_match_response
+        if check == "status":
+            assert "success" in data or "message" in data or "total_analyzed" in data
+            logger.info("✓ ML auto-match endpoint works: %s", data.get('message', data))
+        elif check == "fields":
+            # Check expected fields
+            expected_fields = ["success", "message", "total_analyzed", "auto_matched", "pending_review"]
+            for field in expected_fields:
+                if field in data:
+                    logger.info("✓ Field '%s' present: %s", field, data[field])
+        elif check == "all_matches_list":
+            # Verify all_matches is a list if present
+            if "all_matches" in data:
+                assert isinstance(data["all_matches"], list), "all_matches should be a list"
+                logger.info("✓ all_matches is a list with %s items", len(data['all_matches']))
     
-    def test_ml_suggestions_endpoint_requires_entry_id(self, auth_headers):
+    def test_ml_suggestions_endpoint_requires_entry_id(self, http):
         """Test GET /api/ib-finance/ml-reconcile/suggestions/{entry_id} endpoint"""
         # Test with a non-existent entry ID
         fake_entry_id = "ENTRY-NONEXISTENT"
-        response = requests.get(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/suggestions/{fake_entry_id}",
-            headers=auth_headers
-        )
+        response = http.get(f"{ML}/suggestions/{fake_entry_id}")
         # Should return 404 for non-existent entry
         assert response.status_code in [200, 404], f"Expected 200 or 404, got {response.status_code}"
-        print(f"✓ ML suggestions endpoint responds correctly: {response.status_code}")
+        logger.info("✓ ML suggestions endpoint responds correctly: %s", response.status_code)
     
-    def test_ml_confirm_match_requires_ids(self, auth_headers):
-        """Test POST /api/ib-finance/ml-reconcile/confirm-match requires bank_entry_id and accounting_record_id"""
-        # Test with missing data
-        response = requests.post(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/confirm-match",
-            headers=auth_headers,
-            json={}
-        )
-        # Should return 400 for missing required fields
-        assert response.status_code == 400, f"Expected 400 for missing fields, got {response.status_code}"
-        print("✓ Confirm match validates required fields")
-    
-    def test_ml_confirm_match_with_invalid_ids(self, auth_headers):
+    def test_ml_confirm_match_with_invalid_ids(self, http):
         """Test confirm match with non-existent IDs"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/confirm-match",
-            headers=auth_headers,
+        response = http.post(
+            f"{ML}/confirm-match",
             json={
                 "bank_entry_id": "NONEXISTENT-BANK-ENTRY",
                 "accounting_record_id": "NONEXISTENT-RECORD"
@@ -125,14 +195,13 @@ class TestMLBankReconciliation:
         )
         # Should return 404 for non-existent bank entry
         assert response.status_code == 404, f"Expected 404, got {response.status_code}"
-        print("✓ Confirm match returns 404 for non-existent entries")
+        logger.info("✓ Confirm match returns 404 for non-existent entries")
     
-    def test_ml_analyze_endpoint(self, auth_headers):
+    def test_ml_analyze_endpoint(self, http):
         """Test POST /api/ib-finance/ml-reconcile/analyze endpoint"""
         # Test with sample data
-        response = requests.post(
-            f"{BASE_URL}/api/ib-finance/ml-reconcile/analyze",
-            headers=auth_headers,
+        response = http.post(
+            f"{ML}/analyze",
             json={
                 "bank_entries": [
                     {
@@ -153,28 +222,9 @@ class TestMLBankReconciliation:
                 ]
             }
         )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         assert "success" in data
-        print(f"✓ ML analyze endpoint works: {data}")
-    
-    def test_ml_endpoints_require_auth(self):
-        """Test ML endpoints require authentication"""
-        endpoints = [
-            ("POST", f"{BASE_URL}/api/ib-finance/ml-reconcile/auto-match"),
-            ("GET", f"{BASE_URL}/api/ib-finance/ml-reconcile/suggestions/test"),
-            ("POST", f"{BASE_URL}/api/ib-finance/ml-reconcile/confirm-match"),
-        ]
-        
-        for method, url in endpoints:
-            if method == "POST":
-                response = requests.post(url, json={})
-            else:
-                response = requests.get(url)
-            
-            assert response.status_code in [401, 403], f"Expected 401/403 for {url}, got {response.status_code}"
-        
-        print("✓ All ML endpoints require authentication")
+        logger.info("✓ ML analyze endpoint works: %s", data)
 
 
 # ============== CAP TABLE SCENARIO MODELING TESTS ==============
@@ -182,17 +232,9 @@ class TestMLBankReconciliation:
 class TestCapTableScenarioModeling:
     """Test Cap Table Scenario Modeling APIs"""
     
-    def test_get_scenario_templates(self, auth_headers):
+    def test_get_scenario_templates(self, scenario_templates):
         """Test GET /api/ib-capital/scenario/templates returns templates"""
-        response = requests.get(
-            f"{BASE_URL}/api/ib-capital/scenario/templates",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
-        
-        assert "templates" in data, "Response should contain 'templates'"
-        templates = data["templates"]
+        templates = scenario_templates
         assert isinstance(templates, list), "templates should be a list"
         assert len(templates) >= 1, "Should have at least 1 template"
         
@@ -201,114 +243,64 @@ class TestCapTableScenarioModeling:
             assert "id" in template, "Template should have 'id'"
             assert "name" in template, "Template should have 'name'"
             assert "rounds" in template, "Template should have 'rounds'"
-            print(f"✓ Template: {template['name']} with {len(template['rounds'])} rounds")
+            logger.info("✓ Template: %s with %s rounds", template['name'], len(template['rounds']))
         
-        print(f"✓ Got {len(templates)} scenario templates")
+        logger.info("✓ Got %s scenario templates", len(templates))
     
-    def test_list_scenarios(self, auth_headers):
+    def test_list_scenarios(self, http):
         """Test GET /api/ib-capital/scenario/list returns scenarios"""
-        response = requests.get(
-            f"{BASE_URL}/api/ib-capital/scenario/list",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        response = http.get(f"{CAP}/list")
+        data = ok_json(response)
         
         assert "scenarios" in data, "Response should contain 'scenarios'"
         assert isinstance(data["scenarios"], list), "scenarios should be a list"
-        print(f"✓ Got {len(data['scenarios'])} saved scenarios")
+        logger.info("✓ Got %s saved scenarios", len(data['scenarios']))
     
-    def test_create_scenario(self, auth_headers):
+    def test_create_scenario(self, http, scenario_name):
         """Test POST /api/ib-capital/scenario/create creates a new scenario"""
-        scenario_name = f"TEST_Scenario_{uuid.uuid4().hex[:6]}"
+        name = scenario_name("Scenario")
         
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
+        response = http.post(
+            f"{CAP}/create",
             json={
-                "name": scenario_name,
+                "name": name,
                 "description": "Test scenario for dilution modeling",
                 "base_valuation": 10000000,
                 "base_shares_outstanding": 10000000
             }
         )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         
         assert "scenario_id" in data, "Response should contain 'scenario_id'"
-        assert data["name"] == scenario_name, "Scenario name should match"
+        assert data["name"] == name, "Scenario name should match"
         assert data["base_valuation"] == 10000000, "Base valuation should match"
         
-        print(f"✓ Created scenario: {data['scenario_id']}")
+        logger.info("✓ Created scenario: %s", data['scenario_id'])
         return data["scenario_id"]
     
-    def test_create_scenario_requires_name(self, auth_headers):
-        """Test scenario creation requires name"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
-            json={
-                "description": "Test without name",
-                "base_valuation": 10000000,
-                "base_shares_outstanding": 10000000
-            }
-        )
-        # Should fail validation
-        assert response.status_code in [400, 422], f"Expected 400/422, got {response.status_code}"
-        print("✓ Scenario creation validates required fields")
-    
-    def test_get_scenario_details(self, auth_headers):
+    def test_get_scenario_details(self, http, scenario_pool):
         """Test GET /api/ib-capital/scenario/{scenario_id} returns scenario details"""
-        # First create a scenario
-        scenario_name = f"TEST_Detail_{uuid.uuid4().hex[:6]}"
-        create_response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
-            json={
-                "name": scenario_name,
-                "description": "Test scenario for details",
-                "base_valuation": 15000000,
-                "base_shares_outstanding": 15000000
-            }
-        )
-        assert create_response.status_code == 200
-        scenario_id = create_response.json()["scenario_id"]
+        scenario = scenario_pool.get_nowait()
+        scenario_id = scenario["scenario_id"]
         
         # Get scenario details
-        response = requests.get(
-            f"{BASE_URL}/api/ib-capital/scenario/{scenario_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        response = http.get(f"{CAP}/{scenario_id}")
+        data = ok_json(response)
         
         assert data["scenario_id"] == scenario_id
-        assert data["name"] == scenario_name
+        assert data["name"] == scenario["name"]
         assert "rounds" in data, "Should include rounds array"
         
-        print(f"✓ Got scenario details: {scenario_id}")
+        logger.info("✓ Got scenario details: %s", scenario_id)
     
-    def test_add_round_to_scenario(self, auth_headers):
+    @pytest.mark.slow
+    def test_add_round_to_scenario(self, http, scenario_pool):
         """Test POST /api/ib-capital/scenario/round/add adds a round"""
-        # First create a scenario
-        scenario_name = f"TEST_Round_{uuid.uuid4().hex[:6]}"
-        create_response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
-            json={
-                "name": scenario_name,
-                "description": "Test scenario for rounds",
-                "base_valuation": 10000000,
-                "base_shares_outstanding": 10000000
-            }
-        )
-        assert create_response.status_code == 200
-        scenario_id = create_response.json()["scenario_id"]
+        scenario_id = scenario_pool.get_nowait()["scenario_id"]
         
         # Add a round
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/round/add",
-            headers=auth_headers,
+        response = http.post(
+            f"{CAP}/round/add",
             json={
                 "scenario_id": scenario_id,
                 "round_name": "Seed Round",
@@ -318,8 +310,7 @@ class TestCapTableScenarioModeling:
                 "option_pool_increase": 10
             }
         )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         
         assert "round_id" in data, "Response should contain 'round_id'"
         assert data["round_name"] == "Seed Round"
@@ -328,23 +319,21 @@ class TestCapTableScenarioModeling:
         assert "new_shares_issued" in data, "Should calculate new_shares_issued"
         assert "post_money_valuation" in data, "Should calculate post_money_valuation"
         
-        print(f"✓ Added round: {data['round_id']} with price/share: {data['price_per_share']}")
+        logger.info("✓ Added round: %s with price/share: %s", data['round_id'], data['price_per_share'])
     
-    def test_quick_simulation(self, auth_headers):
+    def test_quick_simulation(self, http):
         """Test POST /api/ib-capital/scenario/simulate-quick calculates dilution"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/simulate-quick",
-            headers=auth_headers,
+        response = http.post(
+            f"{CAP}/simulate-quick",
             json={
-                "current_shares": 10000000,
-                "current_valuation": 10000000,
-                "pre_money_valuation": 10000000,
-                "investment_amount": 2000000,
+                "current_shares": QUICK_SIM_SHARES,
+                "current_valuation": QUICK_SIM_PRE_MONEY,
+                "pre_money_valuation": QUICK_SIM_PRE_MONEY,
+                "investment_amount": QUICK_SIM_INVESTMENT,
                 "option_pool_increase": 0
             }
         )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         
         assert "input" in data, "Response should contain 'input'"
         assert "output" in data, "Response should contain 'output'"
@@ -357,182 +346,110 @@ class TestCapTableScenarioModeling:
         assert "new_investor_ownership_pct" in output
         assert "existing_ownership_pct" in output
         
-        # Verify calculations
-        # With 10M pre-money and 2M investment:
-        # Post-money = 12M
-        # New investor gets 2M/12M = 16.67%
-        # Existing diluted to 83.33%
-        assert output["post_money_valuation"] == 12000000, f"Post-money should be 12M, got {output['post_money_valuation']}"
-        assert abs(output["new_investor_ownership_pct"] - 16.67) < 0.1, f"New investor should own ~16.67%, got {output['new_investor_ownership_pct']}"
-        assert abs(output["existing_ownership_pct"] - 83.33) < 0.1, f"Existing should own ~83.33%, got {output['existing_ownership_pct']}"
+        # Verify calculations: new investor gets 2M/12M, existing holders keep the rest
+        assert output["post_money_valuation"] == EXPECTED_POST_MONEY, f"Post-money should be {EXPECTED_POST_MONEY}, got {output['post_money_valuation']}"
+        assert math.isclose(output["new_investor_ownership_pct"], EXPECTED_NEW_INV_PCT, abs_tol=PCT_ABS_TOL), f"New investor should own ~{EXPECTED_NEW_INV_PCT:.2f}%, got {output['new_investor_ownership_pct']}"
+        assert math.isclose(output["existing_ownership_pct"], EXPECTED_EXISTING_PCT, abs_tol=PCT_ABS_TOL), f"Existing should own ~{EXPECTED_EXISTING_PCT:.2f}%, got {output['existing_ownership_pct']}"
         
-        print(f"✓ Quick simulation works:")
-        print(f"  - Dilution: {output['dilution_percentage']}%")
-        print(f"  - New investor: {output['new_investor_ownership_pct']}%")
-        print(f"  - Existing: {output['existing_ownership_pct']}%")
+        logger.info("✓ Quick simulation works:")
+        logger.info("  - Dilution: %s%%", output['dilution_percentage'])
+        logger.info("  - New investor: %s%%", output['new_investor_ownership_pct'])
+        logger.info("  - Existing: %s%%", output['existing_ownership_pct'])
     
-    def test_quick_simulation_requires_positive_investment(self, auth_headers):
-        """Test quick simulation validates investment amount"""
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/simulate-quick",
-            headers=auth_headers,
-            json={
-                "current_shares": 10000000,
-                "current_valuation": 10000000,
-                "pre_money_valuation": 10000000,
-                "investment_amount": 0,  # Invalid
-                "option_pool_increase": 0
-            }
-        )
-        assert response.status_code == 400, f"Expected 400 for zero investment, got {response.status_code}"
-        print("✓ Quick simulation validates positive investment amount")
-    
-    def test_analyze_dilution(self, auth_headers):
+    @pytest.mark.slow
+    def test_analyze_dilution(self, http, scenario_pool):
         """Test POST /api/ib-capital/scenario/analyze runs dilution analysis"""
-        # Create scenario with rounds
-        scenario_name = f"TEST_Analysis_{uuid.uuid4().hex[:6]}"
-        create_response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
-            json={
-                "name": scenario_name,
-                "description": "Test scenario for analysis",
-                "base_valuation": 10000000,
-                "base_shares_outstanding": 10000000
-            }
-        )
-        assert create_response.status_code == 200
-        scenario_id = create_response.json()["scenario_id"]
+        scenario_id = scenario_pool.get_nowait()["scenario_id"]
         
-        # Add a round
-        requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/round/add",
-            headers=auth_headers,
-            json={
+        # Add the rounds one after another: the backend numbers each round
+        # from the count of existing ones, so concurrent adds could both get
+        # order 1 and the analysis would apply them in either order
+        rounds = [
+            {
                 "scenario_id": scenario_id,
                 "round_name": "Seed",
                 "round_type": "seed",
                 "pre_money_valuation": 10000000,
                 "investment_amount": 2000000,
                 "option_pool_increase": 0
-            }
-        )
+            },
+            {
+                "scenario_id": scenario_id,
+                "round_name": "Series A",
+                "round_type": "series_a",
+                "pre_money_valuation": 40000000,
+                "investment_amount": 10000000,
+                "option_pool_increase": 0
+            },
+        ]
+        for round_data in rounds:
+            ok_json(http.post(f"{CAP}/round/add", json=round_data))
         
         # Run analysis
-        response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/analyze",
-            headers=auth_headers,
+        response = http.post(
+            f"{CAP}/analyze",
             json={"scenario_id": scenario_id}
         )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         
         assert "scenario_id" in data
         assert "summary" in data
         assert "rounds_analysis" in data
         assert "final_ownership" in data
+        assert [r["round_name"] for r in data["rounds_analysis"]] == [r["round_name"] for r in rounds]
         
         summary = data["summary"]
         assert "total_rounds" in summary
+        assert summary["total_rounds"] == len(rounds)
         assert "total_capital_raised" in summary
         assert "final_valuation" in summary
         assert "total_dilution_pct" in summary
         
-        print(f"✓ Dilution analysis complete:")
-        print(f"  - Total rounds: {summary['total_rounds']}")
-        print(f"  - Capital raised: {summary['total_capital_raised']}")
-        print(f"  - Final valuation: {summary['final_valuation']}")
-        print(f"  - Total dilution: {summary['total_dilution_pct']}%")
+        logger.info("✓ Dilution analysis complete:")
+        logger.info("  - Total rounds: %s", summary['total_rounds'])
+        logger.info("  - Capital raised: %s", summary['total_capital_raised'])
+        logger.info("  - Final valuation: %s", summary['final_valuation'])
+        logger.info("  - Total dilution: %s%%", summary['total_dilution_pct'])
     
-    def test_delete_scenario(self, auth_headers):
+    @pytest.mark.slow
+    def test_delete_scenario(self, http, scenario_pool):
         """Test DELETE /api/ib-capital/scenario/{scenario_id} soft deletes scenario"""
-        # Create a scenario to delete
-        scenario_name = f"TEST_Delete_{uuid.uuid4().hex[:6]}"
-        create_response = requests.post(
-            f"{BASE_URL}/api/ib-capital/scenario/create",
-            headers=auth_headers,
-            json={
-                "name": scenario_name,
-                "description": "Test scenario for deletion",
-                "base_valuation": 10000000,
-                "base_shares_outstanding": 10000000
-            }
-        )
-        assert create_response.status_code == 200
-        scenario_id = create_response.json()["scenario_id"]
+        scenario_id = scenario_pool.get_nowait()["scenario_id"]
         
         # Delete the scenario (soft delete)
-        response = requests.delete(
-            f"{BASE_URL}/api/ib-capital/scenario/{scenario_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
-        data = response.json()
+        response = http.delete(f"{CAP}/{scenario_id}")
+        data = ok_json(response)
         assert data.get("success") == True or "deleted" in str(data).lower()
         
         # Verify scenario is not in list (soft deleted scenarios filtered out)
-        list_response = requests.get(
-            f"{BASE_URL}/api/ib-capital/scenario/list",
-            headers=auth_headers
-        )
+        list_response = http.get(f"{CAP}/list")
         scenarios = list_response.json().get("scenarios", [])
         scenario_ids = [s.get("scenario_id") for s in scenarios]
         assert scenario_id not in scenario_ids, "Deleted scenario should not appear in list"
         
-        print(f"✓ Scenario soft deleted: {scenario_id}")
+        logger.info("✓ Scenario soft deleted: %s", scenario_id)
     
-    def test_scenario_endpoints_require_auth(self):
-        """Test scenario endpoints require authentication (except templates which is public)"""
-        # Templates endpoint is public by design
-        templates_response = requests.get(f"{BASE_URL}/api/ib-capital/scenario/templates")
-        assert templates_response.status_code == 200, "Templates endpoint should be public"
-        print("✓ Templates endpoint is public (by design)")
-        
-        # Other endpoints require auth
-        auth_required_endpoints = [
-            ("GET", f"{BASE_URL}/api/ib-capital/scenario/list"),
-            ("POST", f"{BASE_URL}/api/ib-capital/scenario/create"),
-            ("GET", f"{BASE_URL}/api/ib-capital/scenario/test-id"),
-            ("POST", f"{BASE_URL}/api/ib-capital/scenario/round/add"),
-            ("POST", f"{BASE_URL}/api/ib-capital/scenario/simulate-quick"),
-            ("POST", f"{BASE_URL}/api/ib-capital/scenario/analyze"),
-        ]
-        
-        for method, url in auth_required_endpoints:
-            if method == "POST":
-                response = requests.post(url, json={})
-            else:
-                response = requests.get(url)
-            
-            assert response.status_code in [401, 403], f"Expected 401/403 for {url}, got {response.status_code}"
-        
-        print("✓ All protected scenario endpoints require authentication")
+    def test_templates_endpoint_is_public(self, scenario_templates):
+        """Test scenario templates are served without authentication"""
+        # scenario_templates is fetched without a token
+        assert scenario_templates is not None
+        logger.info("✓ Templates endpoint is public (by design)")
 
 
-# ============== CLEANUP ==============
+# ============== AUTHENTICATION TESTS ==============
 
-class TestCleanup:
-    """Cleanup test data"""
-    
-    def test_cleanup_test_scenarios(self, auth_headers):
-        """Clean up TEST_ prefixed scenarios"""
-        # Get all scenarios
-        response = requests.get(
-            f"{BASE_URL}/api/ib-capital/scenario/list",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            scenarios = response.json().get("scenarios", [])
-            deleted = 0
-            for scenario in scenarios:
-                if scenario.get("name", "").startswith("TEST_"):
-                    del_response = requests.delete(
-                        f"{BASE_URL}/api/ib-capital/scenario/{scenario['scenario_id']}",
-                        headers=auth_headers
-                    )
-                    if del_response.status_code == 200:
-                        deleted += 1
-            print(f"✓ Cleaned up {deleted} test scenarios")
+@pytest.mark.parametrize(
+    "method,url",
+    AUTH_REQUIRED_ENDPOINTS,
+    ids=[f"{method} {url[len(BASE_URL):]}" for method, url in AUTH_REQUIRED_ENDPOINTS]
+)
+def test_requires_auth(http_unauth, method, url):
+    """Test protected ML and scenario endpoints reject requests without a token"""
+    if method == "POST":
+        response = http_unauth.post(url, json={})
+    else:
+        response = http_unauth.get(url)
+    assert response.status_code in [401, 403], f"Expected 401/403 for {url}, got {response.status_code}"
 
 
 if __name__ == "__main__":
@@ -1,109 +1,66 @@
 """
 Test Suite for IB Commerce - Parties Module CRUD Operations
 Tests Partners, Channels, and Profiles endpoints
+
+The three resources share one CRUD contract, so a single test class runs
+once per entry in RESOURCES.
+
+By default the tests run against an in-process stand-in for the parties
+API (tests/local_backend.py); pass --remote to exercise the live backend
+at REACT_APP_BACKEND_URL.
+
+The resources are independent, so the file can run under pytest-xdist:
+    pytest -n 3 --dist=loadgroup tests/test_parties_crud.py
+Each resource is one xdist group. Each worker names its entities
+TEST_<RUN_ID>_... and TestCleanup deletes only those, so workers and
+concurrent runs never touch each other's data.
 """
 import pytest
-import requests
+import logging
 import os
-import time
+from types import MappingProxyType
 
-BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+from tests.conftest import run_id
+from tests.local_backend import select_lane
+
+# The default local lane ignores the host, so no backend URL is needed there
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/') or "http://localhost"
+PARTIES = f"{BASE_URL}/api/commerce/parties"
+
+# Response bodies are logged at DEBUG; run with --log-level=DEBUG to see them
+logger = logging.getLogger(__name__)
 
 # Test credentials
 TEST_EMAIL = "demo@innovatebooks.com"
 TEST_PASSWORD = "Demo1234"
 
+# Follows "TEST_" in every TEST_ name; unique per xdist worker and per run
+RUN_ID = run_id()
 
-class TestAuth:
-    """Authentication tests to get token for subsequent tests"""
-    
-    @pytest.fixture(scope="class")
-    def auth_token(self):
-        """Get authentication token"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        print(f"Login response status: {response.status_code}")
-        print(f"Login response: {response.json()}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            assert token is not None, "No token in response"
-            return token
-        pytest.skip(f"Authentication failed: {response.status_code}")
-    
-    def test_login_success(self):
-        """Test login with valid credentials"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        data = response.json()
-        assert "access_token" in data or "token" in data, "No token in response"
-        print(f"Login successful, token received")
-
+# Names TestCleanup deletes: this worker's and this run's own
+CLEANUP_PREFIX = f"TEST_{RUN_ID}_"
 
-class TestPartnersCRUD:
-    """Partners CRUD endpoint tests"""
-    
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_get_partners_list(self, auth_headers):
-        """Test GET /api/commerce/parties/partners - List all partners"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners",
-            headers=auth_headers
-        )
-        print(f"GET partners response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to get partners: {response.text}"
-        data = response.json()
-        assert data.get("success") == True, "Response success should be True"
-        assert "partners" in data, "Response should contain partners array"
-        assert "count" in data, "Response should contain count"
-        print(f"Found {data['count']} partners")
-    
-    def test_get_partners_with_search(self, auth_headers):
-        """Test GET /api/commerce/parties/partners with search parameter"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners?search=test",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Search failed: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        print(f"Search returned {data['count']} partners")
-    
-    def test_get_partners_with_status_filter(self, auth_headers):
-        """Test GET /api/commerce/parties/partners with status filter"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners?status=active",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Filter failed: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        print(f"Active partners: {data['count']}")
-    
-    def test_create_partner(self, auth_headers):
-        """Test POST /api/commerce/parties/partners - Create new partner"""
-        partner_data = {
-            "display_name": "TEST_Partner_Automation",
+# CRUD contract per resource, frozen so no test can mutate another's
+# payload; requests are sent a shallow copy ({**payload}) since JSON
+# encoding needs a real dict:
+#   path       - URL segment under /api/commerce/parties
+#   key        - response key holding the entity; its id field is f"{key}_id"
+#   name       - field holding the entity's display name
+#   prefix     - id prefix used for the non-existent id check
+#   queries    - list filters exercised alongside the plain listing
+#   sample     - full create payload
+#   detail     - minimal payload for the entity shared by detail/update tests
+#   update     - PUT payload; the fields in `verify` are checked afterwards
+#   disposable - payload for the entity created and deleted by the delete test
+RESOURCES = (
+    MappingProxyType({
+        "path": "partners",
+        "key": "partner",
+        "name": "display_name",
+        "prefix": "PART",
+        "queries": ("search=test", "status=active"),
+        "sample": MappingProxyType({
+            "display_name": f"TEST_{RUN_ID}_Partner_Automation",
             "legal_name": "Test Partner Legal Name",
             "party_category": "partner",
             "country_of_registration": "India",
@@ -134,32 +91,9 @@ class TestPartnersCRUD:
                     "is_active": True
                 }
             ]
-        }
-        
-        response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/partners",
-            headers=auth_headers,
-            json=partner_data
-        )
-        print(f"Create partner response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to create partner: {response.text}"
-        data = response.json()
-        assert data.get("success") == True, "Create should return success=True"
-        assert "partner" in data or "partner_id" in data.get("partner", {}), "Response should contain partner data"
-        
-        # Store partner_id for subsequent tests
-        partner = data.get("partner", {})
-        partner_id = partner.get("partner_id")
-        print(f"Created partner with ID: {partner_id}")
-        return partner_id
-    
-    def test_get_partner_detail(self, auth_headers):
-        """Test GET /api/commerce/parties/partners/{partner_id} - Get partner detail"""
-        # First create a partner
-        partner_data = {
-            "display_name": "TEST_Partner_Detail",
+        }),
+        "detail": MappingProxyType({
+            "display_name": f"TEST_{RUN_ID}_Partner_Detail",
             "legal_name": "Test Partner Detail Legal",
             "party_category": "partner",
             "country_of_registration": "India",
@@ -168,57 +102,9 @@ class TestPartnersCRUD:
             "partner_type": "Distributor",
             "contacts": [],
             "locations": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/partners",
-            headers=auth_headers,
-            json=partner_data
-        )
-        assert create_response.status_code == 200, f"Create failed: {create_response.text}"
-        partner_id = create_response.json().get("partner", {}).get("partner_id")
-        
-        # Now get the detail
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners/{partner_id}",
-            headers=auth_headers
-        )
-        print(f"Get partner detail response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to get partner detail: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "partner" in data
-        assert data["partner"]["partner_id"] == partner_id
-        assert data["partner"]["display_name"] == "TEST_Partner_Detail"
-        print(f"Partner detail retrieved successfully: {data['partner']['display_name']}")
-    
-    def test_update_partner(self, auth_headers):
-        """Test PUT /api/commerce/parties/partners/{partner_id} - Update partner"""
-        # First create a partner
-        partner_data = {
-            "display_name": "TEST_Partner_Update",
-            "legal_name": "Test Partner Update Legal",
-            "party_category": "partner",
-            "country_of_registration": "India",
-            "status": "active",
-            "primary_role": "Agent",
-            "partner_type": "Agent",
-            "contacts": [],
-            "locations": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/partners",
-            headers=auth_headers,
-            json=partner_data
-        )
-        assert create_response.status_code == 200
-        partner_id = create_response.json().get("partner", {}).get("partner_id")
-        
-        # Update the partner
-        update_data = {
-            "display_name": "TEST_Partner_Updated",
+        }),
+        "update": MappingProxyType({
+            "display_name": f"TEST_{RUN_ID}_Partner_Updated",
             "legal_name": "Test Partner Updated Legal",
             "party_category": "partner",
             "country_of_registration": "USA",
@@ -227,35 +113,10 @@ class TestPartnersCRUD:
             "partner_type": "Strategic",
             "contacts": [],
             "locations": []
-        }
-        
-        response = requests.put(
-            f"{BASE_URL}/api/commerce/parties/partners/{partner_id}",
-            headers=auth_headers,
-            json=update_data
-        )
-        print(f"Update partner response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to update partner: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        
-        # Verify update by getting the partner
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners/{partner_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 200
-        updated_partner = get_response.json().get("partner", {})
-        assert updated_partner["display_name"] == "TEST_Partner_Updated"
-        assert updated_partner["country_of_registration"] == "USA"
-        print(f"Partner updated successfully")
-    
-    def test_delete_partner(self, auth_headers):
-        """Test DELETE /api/commerce/parties/partners/{partner_id} - Delete partner"""
-        # First create a partner
-        partner_data = {
-            "display_name": "TEST_Partner_Delete",
+        }),
+        "verify": ("display_name", "country_of_registration"),
+        "disposable": MappingProxyType({
+            "display_name": f"TEST_{RUN_ID}_Partner_Delete",
             "legal_name": "Test Partner Delete Legal",
             "party_category": "partner",
             "country_of_registration": "India",
@@ -264,92 +125,16 @@ class TestPartnersCRUD:
             "partner_type": "Referral",
             "contacts": [],
             "locations": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/partners",
-            headers=auth_headers,
-            json=partner_data
-        )
-        assert create_response.status_code == 200
-        partner_id = create_response.json().get("partner", {}).get("partner_id")
-        
-        # Delete the partner
-        response = requests.delete(
-            f"{BASE_URL}/api/commerce/parties/partners/{partner_id}",
-            headers=auth_headers
-        )
-        print(f"Delete partner response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to delete partner: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        
-        # Verify deletion by trying to get the partner
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners/{partner_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 404, "Deleted partner should return 404"
-        print(f"Partner deleted successfully")
-    
-    def test_get_nonexistent_partner(self, auth_headers):
-        """Test GET /api/commerce/parties/partners/{partner_id} - Non-existent partner"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners/PART-NONEXISTENT",
-            headers=auth_headers
-        )
-        assert response.status_code == 404, f"Should return 404 for non-existent partner"
-        print("Non-existent partner correctly returns 404")
-
-
-class TestChannelsCRUD:
-    """Channels CRUD endpoint tests"""
-    
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_get_channels_list(self, auth_headers):
-        """Test GET /api/commerce/parties/channels - List all channels"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels",
-            headers=auth_headers
-        )
-        print(f"GET channels response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to get channels: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "channels" in data
-        assert "count" in data
-        print(f"Found {data['count']} channels")
-    
-    def test_get_channels_with_filters(self, auth_headers):
-        """Test GET /api/commerce/parties/channels with filters"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels?status=active&channel_type=Direct Sales",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Filter failed: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        print(f"Filtered channels: {data['count']}")
-    
-    def test_create_channel(self, auth_headers):
-        """Test POST /api/commerce/parties/channels - Create new channel"""
-        channel_data = {
-            "channel_name": "TEST_Channel_Automation",
+        }),
+    }),
+    MappingProxyType({
+        "path": "channels",
+        "key": "channel",
+        "name": "channel_name",
+        "prefix": "CHAN",
+        "queries": ("status=active&channel_type=Direct Sales",),
+        "sample": MappingProxyType({
+            "channel_name": f"TEST_{RUN_ID}_Channel_Automation",
             "channel_type": "Direct Sales",
             "channel_owner": "Sales Team",
             "geography": ["India", "USA"],
@@ -359,210 +144,42 @@ class TestChannelsCRUD:
             "conflict_rules": "No overlap with existing channels",
             "status": "active",
             "description": "Test channel for automation"
-        }
-        
-        response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/channels",
-            headers=auth_headers,
-            json=channel_data
-        )
-        print(f"Create channel response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to create channel: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "channel" in data
-        
-        channel = data.get("channel", {})
-        channel_id = channel.get("channel_id")
-        print(f"Created channel with ID: {channel_id}")
-        return channel_id
-    
-    def test_get_channel_detail(self, auth_headers):
-        """Test GET /api/commerce/parties/channels/{channel_id} - Get channel detail"""
-        # First create a channel
-        channel_data = {
-            "channel_name": "TEST_Channel_Detail",
+        }),
+        "detail": MappingProxyType({
+            "channel_name": f"TEST_{RUN_ID}_Channel_Detail",
             "channel_type": "Online",
             "status": "active",
             "geography": [],
             "allowed_party_types": [],
             "allowed_profiles": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/channels",
-            headers=auth_headers,
-            json=channel_data
-        )
-        assert create_response.status_code == 200
-        channel_id = create_response.json().get("channel", {}).get("channel_id")
-        
-        # Get the detail
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels/{channel_id}",
-            headers=auth_headers
-        )
-        print(f"Get channel detail response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to get channel detail: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "channel" in data
-        assert data["channel"]["channel_id"] == channel_id
-        assert data["channel"]["channel_name"] == "TEST_Channel_Detail"
-        print(f"Channel detail retrieved successfully")
-    
-    def test_update_channel(self, auth_headers):
-        """Test PUT /api/commerce/parties/channels/{channel_id} - Update channel"""
-        # First create a channel
-        channel_data = {
-            "channel_name": "TEST_Channel_Update",
-            "channel_type": "Retail",
-            "status": "active",
-            "geography": [],
-            "allowed_party_types": [],
-            "allowed_profiles": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/channels",
-            headers=auth_headers,
-            json=channel_data
-        )
-        assert create_response.status_code == 200
-        channel_id = create_response.json().get("channel", {}).get("channel_id")
-        
-        # Update the channel
-        update_data = {
-            "channel_name": "TEST_Channel_Updated",
+        }),
+        "update": MappingProxyType({
+            "channel_name": f"TEST_{RUN_ID}_Channel_Updated",
             "channel_type": "Marketplace",
             "status": "on_hold",
             "geography": ["Europe"],
             "allowed_party_types": ["Vendor"],
             "allowed_profiles": ["Enterprise"],
             "description": "Updated description"
-        }
-        
-        response = requests.put(
-            f"{BASE_URL}/api/commerce/parties/channels/{channel_id}",
-            headers=auth_headers,
-            json=update_data
-        )
-        print(f"Update channel response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to update channel: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        
-        # Verify update
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels/{channel_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 200
-        updated_channel = get_response.json().get("channel", {})
-        assert updated_channel["channel_name"] == "TEST_Channel_Updated"
-        assert updated_channel["channel_type"] == "Marketplace"
-        print(f"Channel updated successfully")
-    
-    def test_delete_channel(self, auth_headers):
-        """Test DELETE /api/commerce/parties/channels/{channel_id} - Delete channel"""
-        # First create a channel
-        channel_data = {
-            "channel_name": "TEST_Channel_Delete",
+        }),
+        "verify": ("channel_name", "channel_type"),
+        "disposable": MappingProxyType({
+            "channel_name": f"TEST_{RUN_ID}_Channel_Delete",
             "channel_type": "Agent",
             "status": "active",
             "geography": [],
             "allowed_party_types": [],
             "allowed_profiles": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/channels",
-            headers=auth_headers,
-            json=channel_data
-        )
-        assert create_response.status_code == 200
-        channel_id = create_response.json().get("channel", {}).get("channel_id")
-        
-        # Delete the channel
-        response = requests.delete(
-            f"{BASE_URL}/api/commerce/parties/channels/{channel_id}",
-            headers=auth_headers
-        )
-        print(f"Delete channel response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to delete channel: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        
-        # Verify deletion
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels/{channel_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 404
-        print(f"Channel deleted successfully")
-    
-    def test_get_nonexistent_channel(self, auth_headers):
-        """Test GET /api/commerce/parties/channels/{channel_id} - Non-existent channel"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels/CHAN-NONEXISTENT",
-            headers=auth_headers
-        )
-        assert response.status_code == 404
-        print("Non-existent channel correctly returns 404")
-
-
-class TestProfilesCRUD:
-    """Profiles CRUD endpoint tests"""
-    
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_get_profiles_list(self, auth_headers):
-        """Test GET /api/commerce/parties/profiles - List all profiles"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles",
-            headers=auth_headers
-        )
-        print(f"GET profiles response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to get profiles: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "profiles" in data
-        assert "count" in data
-        print(f"Found {data['count']} profiles")
-    
-    def test_get_profiles_with_filters(self, auth_headers):
-        """Test GET /api/commerce/parties/profiles with filters"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles?status=active&profile_type=Customer",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Filter failed: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        print(f"Filtered profiles: {data['count']}")
-    
-    def test_create_profile(self, auth_headers):
-        """Test POST /api/commerce/parties/profiles - Create new profile"""
-        profile_data = {
-            "profile_name": "TEST_Profile_Automation",
+        }),
+    }),
+    MappingProxyType({
+        "path": "profiles",
+        "key": "profile",
+        "name": "profile_name",
+        "prefix": "PROF",
+        "queries": ("status=active&profile_type=Customer",),
+        "sample": MappingProxyType({
+            "profile_name": f"TEST_{RUN_ID}_Profile_Automation",
             "profile_type": "Customer",
             "applicable_regions": ["India", "USA"],
             "applicable_industries": ["Technology", "Finance"],
@@ -579,84 +196,17 @@ class TestProfilesCRUD:
             "policy_references": ["POL-001", "POL-002"],
             "status": "active",
             "description": "Test profile for automation"
-        }
-        
-        response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/profiles",
-            headers=auth_headers,
-            json=profile_data
-        )
-        print(f"Create profile response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to create profile: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "profile" in data
-        
-        profile = data.get("profile", {})
-        profile_id = profile.get("profile_id")
-        print(f"Created profile with ID: {profile_id}")
-        return profile_id
-    
-    def test_get_profile_detail(self, auth_headers):
-        """Test GET /api/commerce/parties/profiles/{profile_id} - Get profile detail"""
-        # First create a profile
-        profile_data = {
-            "profile_name": "TEST_Profile_Detail",
+        }),
+        "detail": MappingProxyType({
+            "profile_name": f"TEST_{RUN_ID}_Profile_Detail",
             "profile_type": "Vendor",
             "status": "active",
             "applicable_regions": [],
             "applicable_industries": [],
             "policy_references": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/profiles",
-            headers=auth_headers,
-            json=profile_data
-        )
-        assert create_response.status_code == 200
-        profile_id = create_response.json().get("profile", {}).get("profile_id")
-        
-        # Get the detail
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles/{profile_id}",
-            headers=auth_headers
-        )
-        print(f"Get profile detail response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to get profile detail: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        assert "profile" in data
-        assert data["profile"]["profile_id"] == profile_id
-        assert data["profile"]["profile_name"] == "TEST_Profile_Detail"
-        print(f"Profile detail retrieved successfully")
-    
-    def test_update_profile(self, auth_headers):
-        """Test PUT /api/commerce/parties/profiles/{profile_id} - Update profile"""
-        # First create a profile
-        profile_data = {
-            "profile_name": "TEST_Profile_Update",
-            "profile_type": "Partner",
-            "status": "active",
-            "applicable_regions": [],
-            "applicable_industries": [],
-            "policy_references": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/profiles",
-            headers=auth_headers,
-            json=profile_data
-        )
-        assert create_response.status_code == 200
-        profile_id = create_response.json().get("profile", {}).get("profile_id")
-        
-        # Update the profile
-        update_data = {
-            "profile_name": "TEST_Profile_Updated",
+        }),
+        "update": MappingProxyType({
+            "profile_name": f"TEST_{RUN_ID}_Profile_Updated",
             "profile_type": "Enterprise",
             "status": "on_hold",
             "applicable_regions": ["Europe"],
@@ -664,142 +214,190 @@ class TestProfilesCRUD:
             "policy_references": ["POL-003"],
             "discount_ceiling": 20.0,
             "description": "Updated description"
-        }
-        
-        response = requests.put(
-            f"{BASE_URL}/api/commerce/parties/profiles/{profile_id}",
-            headers=auth_headers,
-            json=update_data
-        )
-        print(f"Update profile response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to update profile: {response.text}"
-        data = response.json()
-        assert data.get("success") == True
-        
-        # Verify update
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles/{profile_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 200
-        updated_profile = get_response.json().get("profile", {})
-        assert updated_profile["profile_name"] == "TEST_Profile_Updated"
-        assert updated_profile["profile_type"] == "Enterprise"
-        print(f"Profile updated successfully")
-    
-    def test_delete_profile(self, auth_headers):
-        """Test DELETE /api/commerce/parties/profiles/{profile_id} - Delete profile"""
-        # First create a profile
-        profile_data = {
-            "profile_name": "TEST_Profile_Delete",
+        }),
+        "verify": ("profile_name", "profile_type"),
+        "disposable": MappingProxyType({
+            "profile_name": f"TEST_{RUN_ID}_Profile_Delete",
             "profile_type": "Standard",
             "status": "active",
             "applicable_regions": [],
             "applicable_industries": [],
             "policy_references": []
-        }
-        
-        create_response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/profiles",
-            headers=auth_headers,
-            json=profile_data
+        }),
+    }),
+)
+
+
+@pytest.fixture(scope="module")
+def http_unauth(request):
+    """Unauthenticated session: live with --remote, otherwise in-process"""
+    return select_lane(request, "http_unauth")
+
+
+@pytest.fixture(scope="module")
+def http(request):
+    """Authenticated session: live with --remote, otherwise in-process"""
+    return select_lane(request, "http")
+
+
+# One parameter per resource, each in its own xdist group, so under
+# --dist=loadgroup a resource's tests and its cleanup share one worker and
+# that worker's CLEANUP_PREFIX matches what they created
+RESOURCE_PARAMS = [
+    pytest.param(spec, id=spec["path"], marks=pytest.mark.xdist_group(f"parties_{spec['path']}"))
+    for spec in RESOURCES
+]
+
+
+@pytest.fixture(scope="module", params=RESOURCE_PARAMS)
+def spec(request):
+    """CRUD contract of the resource under test"""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def created_entities(http, parallel):
+    """One entity per resource for the detail and update tests, created
+    concurrently up front and deleted concurrently after the module"""
+    def create(spec):
+        response = http.post(f"{PARTIES}/{spec['path']}", json={**spec["detail"]})
+        assert response.status_code == 200, f"Create failed: {response.text}"
+        return response.json()[spec["key"]][f"{spec['key']}_id"]
+
+    entity_ids = dict(zip([spec["path"] for spec in RESOURCES], parallel(create, RESOURCES)))
+    yield entity_ids
+    parallel(http.delete, [f"{PARTIES}/{path}/{entity_id}" for path, entity_id in entity_ids.items()])
+
+
+@pytest.fixture(scope="module")
+def created(created_entities, spec):
+    """Id of the shared entity for the resource under test"""
+    return created_entities[spec["path"]]
+
+
+class TestAuth:
+    """Login check; other classes share the session auth_headers fixture from conftest.py"""
+
+    def test_login_success(self, http_unauth):
+        """Test login with valid credentials"""
+        response = http_unauth.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
         )
+        assert response.status_code == 200, f"Login failed: {response.text}"
+        data = response.json()
+        assert "access_token" in data or "token" in data, "No token in response"
+        logger.info("Login successful, token received")
+
+
+class TestPartiesCRUD:
+    """Partners, Channels and Profiles CRUD endpoint tests, one run per resource"""
+
+    def test_list(self, http, parallel, spec):
+        """Test GET /api/commerce/parties/{path} - List plus filtered lists, fetched concurrently"""
+        url = f"{PARTIES}/{spec['path']}"
+        response, *filtered = parallel(http.get, [url] + [f"{url}?{query}" for query in spec["queries"]])
+        logger.debug("GET %s response: %s", spec["path"], response.status_code)
+        assert response.status_code == 200, f"Failed to get {spec['path']}: {response.text}"
+        data = response.json()
+        logger.debug("Response body: %s", data)
+
+        assert data.get("success") == True, "Response success should be True"
+        assert spec["path"] in data, f"Response should contain {spec['path']} array"
+        assert "count" in data, "Response should contain count"
+        logger.info("Found %s %s", data["count"], spec["path"])
+
+        for query, filter_response in zip(spec["queries"], filtered):
+            assert filter_response.status_code == 200, f"Filter {query} failed: {filter_response.text}"
+            data = filter_response.json()
+            assert data.get("success") == True
+            logger.info("%s: %s %s", query, data["count"], spec["path"])
+
+    def test_create(self, http, spec):
+        """Test POST /api/commerce/parties/{path} - Create new entity"""
+        response = http.post(f"{PARTIES}/{spec['path']}", json={**spec["sample"]})
+        logger.debug("Create %s response: %s", spec["key"], response.status_code)
+        assert response.status_code == 200, f"Failed to create {spec['key']}: {response.text}"
+        data = response.json()
+        logger.debug("Response body: %s", data)
+
+        assert data.get("success") == True, "Create should return success=True"
+        assert spec["key"] in data, f"Response should contain {spec['key']} data"
+
+        entity_id = data[spec["key"]].get(f"{spec['key']}_id")
+        logger.info("Created %s with ID: %s", spec["key"], entity_id)
+
+    def test_get_detail(self, http, spec, created):
+        """Test GET /api/commerce/parties/{path}/{id} - Get entity detail"""
+        response = http.get(f"{PARTIES}/{spec['path']}/{created}")
+        logger.debug("Get %s detail response: %s", spec["key"], response.status_code)
+
+        assert response.status_code == 200, f"Failed to get {spec['key']} detail: {response.text}"
+        data = response.json()
+        assert data.get("success") == True
+        assert spec["key"] in data
+        entity = data[spec["key"]]
+        assert entity[f"{spec['key']}_id"] == created
+        # The update test renames the shared entity, so only the prefix is fixed
+        assert entity[spec["name"]].startswith("TEST_")
+        logger.info("%s detail retrieved successfully: %s", spec["key"], entity[spec["name"]])
+
+    def test_update(self, http, spec, created, request):
+        """Test PUT /api/commerce/parties/{path}/{id} - Update entity"""
+        response = http.put(f"{PARTIES}/{spec['path']}/{created}", json={**spec["update"]})
+        logger.debug("Update %s response: %s", spec["key"], response.status_code)
+
+        assert response.status_code == 200, f"Failed to update {spec['key']}: {response.text}"
+        data = response.json()
+        assert data.get("success") == True
+
+        # PUT returns the updated entity; --thorough also re-reads it
+        updated = data[spec["key"]]
+        if request.config.getoption("--thorough"):
+            get_response = http.get(f"{PARTIES}/{spec['path']}/{created}")
+            assert get_response.status_code == 200
+            updated = get_response.json().get(spec["key"], {})
+        for field in spec["verify"]:
+            assert updated[field] == spec["update"][field], f"{field} was not updated"
+        logger.info("%s updated successfully", spec["key"])
+
+    def test_delete(self, http, spec, request):
+        """Test DELETE /api/commerce/parties/{path}/{id} - Delete entity"""
+        # First create an entity to delete
+        create_response = http.post(f"{PARTIES}/{spec['path']}", json={**spec["disposable"]})
         assert create_response.status_code == 200
-        profile_id = create_response.json().get("profile", {}).get("profile_id")
-        
-        # Delete the profile
-        response = requests.delete(
-            f"{BASE_URL}/api/commerce/parties/profiles/{profile_id}",
-            headers=auth_headers
-        )
-        print(f"Delete profile response: {response.status_code}")
-        
-        assert response.status_code == 200, f"Failed to delete profile: {response.text}"
+        entity_id = create_response.json().get(spec["key"], {}).get(f"{spec['key']}_id")
+
+        response = http.delete(f"{PARTIES}/{spec['path']}/{entity_id}")
+        logger.debug("Delete %s response: %s", spec["key"], response.status_code)
+
+        assert response.status_code == 200, f"Failed to delete {spec['key']}: {response.text}"
         data = response.json()
         assert data.get("success") == True
-        
-        # Verify deletion
-        get_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles/{profile_id}",
-            headers=auth_headers
-        )
-        assert get_response.status_code == 404
-        print(f"Profile deleted successfully")
-    
-    def test_get_nonexistent_profile(self, auth_headers):
-        """Test GET /api/commerce/parties/profiles/{profile_id} - Non-existent profile"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles/PROF-NONEXISTENT",
-            headers=auth_headers
-        )
-        assert response.status_code == 404
-        print("Non-existent profile correctly returns 404")
+
+        # success=True is enough; --thorough also checks the entity is gone
+        if request.config.getoption("--thorough"):
+            get_response = http.get(f"{PARTIES}/{spec['path']}/{entity_id}")
+            assert get_response.status_code == 404, f"Deleted {spec['key']} should return 404"
+        logger.info("%s deleted successfully", spec["key"])
+
+    def test_get_nonexistent(self, http, spec):
+        """Test GET /api/commerce/parties/{path}/{id} - Non-existent id returns 404"""
+        response = http.get(f"{PARTIES}/{spec['path']}/{spec['prefix']}-NONEXISTENT")
+        assert response.status_code == 404, f"Should return 404 for non-existent {spec['key']}"
 
 
 class TestCleanup:
     """Cleanup test data after tests"""
-    
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_cleanup_test_partners(self, auth_headers):
-        """Clean up TEST_ prefixed partners"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/partners?search=TEST_",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            partners = response.json().get("partners", [])
-            for partner in partners:
-                if partner.get("display_name", "").startswith("TEST_"):
-                    requests.delete(
-                        f"{BASE_URL}/api/commerce/parties/partners/{partner['partner_id']}",
-                        headers=auth_headers
-                    )
-                    print(f"Deleted test partner: {partner['partner_id']}")
-    
-    def test_cleanup_test_channels(self, auth_headers):
-        """Clean up TEST_ prefixed channels"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/channels?search=TEST_",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            channels = response.json().get("channels", [])
-            for channel in channels:
-                if channel.get("channel_name", "").startswith("TEST_"):
-                    requests.delete(
-                        f"{BASE_URL}/api/commerce/parties/channels/{channel['channel_id']}",
-                        headers=auth_headers
-                    )
-                    print(f"Deleted test channel: {channel['channel_id']}")
-    
-    def test_cleanup_test_profiles(self, auth_headers):
-        """Clean up TEST_ prefixed profiles"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/profiles?search=TEST_",
-            headers=auth_headers
-        )
+
+    @pytest.mark.parametrize("spec", RESOURCE_PARAMS)
+    def test_cleanup_test_entities(self, http, parallel, spec):
+        """Clean up this run's TEST_ partners, channels and profiles"""
+        response = http.get(f"{PARTIES}/{spec['path']}", params={"prefix": CLEANUP_PREFIX})
         if response.status_code == 200:
-            profiles = response.json().get("profiles", [])
-            for profile in profiles:
-                if profile.get("profile_name", "").startswith("TEST_"):
-                    requests.delete(
-                        f"{BASE_URL}/api/commerce/parties/profiles/{profile['profile_id']}",
-                        headers=auth_headers
-                    )
-                    print(f"Deleted test profile: {profile['profile_id']}")
+            entity_ids = [entity[f"{spec['key']}_id"] for entity in response.json().get(spec["path"], [])]
+            parallel(http.delete, [f"{PARTIES}/{spec['path']}/{entity_id}" for entity_id in entity_ids])
+            logger.info("Deleted %s test %s: %s", len(entity_ids), spec["path"], entity_ids)
 
 
 if __name__ == "__main__":
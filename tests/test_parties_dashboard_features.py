@@ -1,49 +1,131 @@
 """
 Test Suite for IB Commerce - Parties Dashboard and New Features
 Tests Dashboard Stats, Bulk Operations, and Enhanced Vendors List
+
+Calls go through the authenticated session from conftest.py: it logs in
+once per session and reuses pooled keep-alive connections to the backend.
+
+The read-only tests are independent and can spread across pytest-xdist
+workers. The bulk create and cleanup classes share the "parties_bulk"
+group, so they stay on one worker, in order:
+    pytest -n auto --dist=loadgroup tests/test_parties_dashboard_features.py
+
+Bulk-created names start with TEST_<RUN_ID>_Bulk_, and the cleanup also
+sweeps that prefix, so it removes what an aborted run left behind when
+rerun with the same TEST_RUN_ID, and never touches another run's data.
 """
 import pytest
-import requests
+import json
+import logging
 import os
 
+from tests.conftest import run_id
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
-# Test credentials
-TEST_EMAIL = "demo@innovatebooks.com"
-TEST_PASSWORD = "Demo1234"
+# Response bodies are logged at DEBUG; run with --log-level=DEBUG to see them
+logger = logging.getLogger(__name__)
+
+# Names of the parties test_bulk_create makes and the cleanup sweeps; unique
+# per xdist worker and per run
+BULK_PREFIX = f"TEST_{run_id()}_Bulk_"
+
+
+def encode_json(payload):
+    """Request body bytes, encoded with orjson when it is installed; the
+    session already sends Content-Type: application/json"""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+
+
+# Bulk-create payloads, built once at import
+CUSTOMERS_DATA = [
+    {
+        "display_name": f"{BULK_PREFIX}Customer_A",
+        "legal_name": "Test Bulk Customer A Ltd",
+        "party_category": "customer",
+        "country_of_registration": "India",
+        "status": "active",
+        "primary_role": "Buyer",
+        "customer_type": "B2B",
+        "contacts": [],
+        "locations": []
+    },
+    {
+        "display_name": f"{BULK_PREFIX}Customer_B",
+        "legal_name": "Test Bulk Customer B Ltd",
+        "party_category": "customer",
+        "country_of_registration": "USA",
+        "status": "active",
+        "primary_role": "Buyer",
+        "customer_type": "B2C",
+        "contacts": [],
+        "locations": []
+    }
+]
+
+VENDORS_DATA = [
+    {
+        "display_name": f"{BULK_PREFIX}Vendor_A",
+        "legal_name": "Test Bulk Vendor A Ltd",
+        "party_category": "vendor",
+        "country_of_registration": "India",
+        "status": "active",
+        "primary_role": "Supplier",
+        "vendor_type": "Material",
+        "contacts": [],
+        "locations": []
+    },
+    {
+        "display_name": f"{BULK_PREFIX}Vendor_B",
+        "legal_name": "Test Bulk Vendor B Ltd",
+        "party_category": "vendor",
+        "country_of_registration": "USA",
+        "status": "active",
+        "primary_role": "Supplier",
+        "vendor_type": "Service",
+        "contacts": [],
+        "locations": []
+    }
+]
+
+# Request bodies encoded once at import, so each run just sends the bytes
+BULK_BODIES = {
+    "customers": encode_json(CUSTOMERS_DATA),
+    "vendors": encode_json(VENDORS_DATA),
+}
+
+
+@pytest.fixture(scope="module")
+def created_ids():
+    """Ids returned by the bulk-create tests, per party type, for cleanup"""
+    return {"customers": [], "vendors": []}
+
+
+@pytest.fixture(scope="class")
+def dashboard_stats(http):
+    """Fetch the read-only dashboard stats once for the whole class"""
+    response = http.get(f"{BASE_URL}/api/commerce/parties/dashboard/stats")
+    logger.debug("Dashboard stats response: %s", response.status_code)
+
+    assert response.status_code == 200, f"Failed to get dashboard stats: {response.text}"
+    data = response.json()
+    logger.debug("Response body: %s", data)
+    assert data.get("success") == True, "Response success should be True"
+    assert "stats" in data, "Response should contain stats object"
+    return data["stats"]
 
 
 class TestDashboardStats:
     """Dashboard statistics endpoint tests"""
     
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_get_dashboard_stats(self, auth_headers):
+    def test_get_dashboard_stats(self, dashboard_stats):
         """Test GET /api/commerce/parties/dashboard/stats - Get all party stats"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/dashboard/stats",
-            headers=auth_headers
-        )
-        print(f"Dashboard stats response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to get dashboard stats: {response.text}"
-        data = response.json()
-        assert data.get("success") == True, "Response success should be True"
-        assert "stats" in data, "Response should contain stats object"
-        
-        stats = data["stats"]
+        stats = dashboard_stats
         # Verify all party types are present
         assert "customers" in stats, "Stats should contain customers"
         assert "vendors" in stats, "Stats should contain vendors"
@@ -59,175 +141,75 @@ class TestDashboardStats:
         # Vendors should have critical count
         assert "critical" in stats["vendors"], "Vendors should have critical count"
         
-        print(f"Dashboard stats verified successfully")
-        print(f"Customers: {stats['customers']['total']} total, {stats['customers']['active']} active")
-        print(f"Vendors: {stats['vendors']['total']} total, {stats['vendors']['active']} active, {stats['vendors']['critical']} critical")
+        logger.info("Dashboard stats verified successfully")
+        logger.info("Customers: %s total, %s active", stats['customers']['total'], stats['customers']['active'])
+        logger.info(
+            "Vendors: %s total, %s active, %s critical",
+            stats['vendors']['total'], stats['vendors']['active'], stats['vendors']['critical']
+        )
 
 
+@pytest.mark.xdist_group("parties_bulk")
 class TestBulkOperations:
     """Bulk operations endpoint tests"""
     
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    @pytest.mark.parametrize("entity,payload", [
+        ("customers", CUSTOMERS_DATA),
+        ("vendors", VENDORS_DATA),
+    ], ids=["customers", "vendors"])
+    def test_bulk_create(self, http, created_ids, entity, payload):
+        """Test POST /api/commerce/parties/bulk/{entity} - Bulk create customers and vendors"""
+        response = http.post(
+            f"{BASE_URL}/api/commerce/parties/bulk/{entity}",
+            data=BULK_BODIES[entity]
         )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_bulk_create_customers(self, auth_headers):
-        """Test POST /api/commerce/parties/bulk/customers - Bulk create customers"""
-        customers_data = [
-            {
-                "display_name": "TEST_Bulk_Customer_A",
-                "legal_name": "Test Bulk Customer A Ltd",
-                "party_category": "customer",
-                "country_of_registration": "India",
-                "status": "active",
-                "primary_role": "Buyer",
-                "customer_type": "B2B",
-                "contacts": [],
-                "locations": []
-            },
-            {
-                "display_name": "TEST_Bulk_Customer_B",
-                "legal_name": "Test Bulk Customer B Ltd",
-                "party_category": "customer",
-                "country_of_registration": "USA",
-                "status": "active",
-                "primary_role": "Buyer",
-                "customer_type": "B2C",
-                "contacts": [],
-                "locations": []
-            }
-        ]
-        
-        response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/bulk/customers",
-            headers=auth_headers,
-            json=customers_data
-        )
-        print(f"Bulk create customers response: {response.status_code}")
-        print(f"Response body: {response.json()}")
+        logger.debug("Bulk create %s response: %s", entity, response.status_code)
         
-        assert response.status_code == 200, f"Failed to bulk create customers: {response.text}"
+        assert response.status_code == 200, f"Failed to bulk create {entity}: {response.text}"
         data = response.json()
+        logger.debug("Response body: %s", data)
         assert data.get("success") == True, "Response success should be True"
         assert "created" in data, "Response should contain created list"
-        assert len(data["created"]) == 2, "Should have created 2 customers"
+        assert len(data["created"]) == len(payload), f"Should have created {len(payload)} {entity}"
         assert "errors" in data, "Response should contain errors list"
         assert len(data["errors"]) == 0, "Should have no errors"
         
-        print(f"Bulk created customers: {data['created']}")
-        
-        # Store IDs for cleanup
-        return data["created"]
-    
-    def test_bulk_create_vendors(self, auth_headers):
-        """Test POST /api/commerce/parties/bulk/vendors - Bulk create vendors"""
-        vendors_data = [
-            {
-                "display_name": "TEST_Bulk_Vendor_A",
-                "legal_name": "Test Bulk Vendor A Ltd",
-                "party_category": "vendor",
-                "country_of_registration": "India",
-                "status": "active",
-                "primary_role": "Supplier",
-                "vendor_type": "Material",
-                "contacts": [],
-                "locations": []
-            },
-            {
-                "display_name": "TEST_Bulk_Vendor_B",
-                "legal_name": "Test Bulk Vendor B Ltd",
-                "party_category": "vendor",
-                "country_of_registration": "USA",
-                "status": "active",
-                "primary_role": "Supplier",
-                "vendor_type": "Service",
-                "contacts": [],
-                "locations": []
-            }
-        ]
-        
-        response = requests.post(
-            f"{BASE_URL}/api/commerce/parties/bulk/vendors",
-            headers=auth_headers,
-            json=vendors_data
-        )
-        print(f"Bulk create vendors response: {response.status_code}")
-        print(f"Response body: {response.json()}")
-        
-        assert response.status_code == 200, f"Failed to bulk create vendors: {response.text}"
-        data = response.json()
-        assert data.get("success") == True, "Response success should be True"
-        assert "created" in data, "Response should contain created list"
-        assert len(data["created"]) == 2, "Should have created 2 vendors"
-        
-        print(f"Bulk created vendors: {data['created']}")
+        logger.info("Bulk created %s: %s", entity, data['created'])
+        # Cleanup deletes these ids directly instead of listing them again
+        created_ids[entity].extend(data["created"])
 
 
 class TestVendorsListFeatures:
     """Vendors list enhanced features tests"""
     
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_vendors_list_with_search(self, auth_headers):
+    def test_vendors_list_with_search(self, http):
         """Test GET /api/commerce/parties/vendors with search"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors?search=Cloud",
-            headers=auth_headers
-        )
+        response = http.get(f"{BASE_URL}/api/commerce/parties/vendors?search=Cloud")
         assert response.status_code == 200, f"Search failed: {response.text}"
         data = response.json()
         assert data.get("success") == True
-        print(f"Search 'Cloud' returned {data['count']} vendors")
+        logger.info("Search 'Cloud' returned %s vendors", data['count'])
     
-    def test_vendors_list_with_type_filter(self, auth_headers):
+    def test_vendors_list_with_type_filter(self, http):
         """Test GET /api/commerce/parties/vendors with vendor_type filter"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors?vendor_type=Service",
-            headers=auth_headers
-        )
+        response = http.get(f"{BASE_URL}/api/commerce/parties/vendors?vendor_type=Service")
         assert response.status_code == 200, f"Filter failed: {response.text}"
         data = response.json()
         assert data.get("success") == True
-        print(f"Service vendors: {data['count']}")
+        logger.info("Service vendors: %s", data['count'])
     
-    def test_vendors_list_with_status_filter(self, auth_headers):
+    def test_vendors_list_with_status_filter(self, http):
         """Test GET /api/commerce/parties/vendors with status filter"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors?status=active",
-            headers=auth_headers
-        )
+        response = http.get(f"{BASE_URL}/api/commerce/parties/vendors?status=active")
         assert response.status_code == 200, f"Filter failed: {response.text}"
         data = response.json()
         assert data.get("success") == True
-        print(f"Active vendors: {data['count']}")
+        logger.info("Active vendors: %s", data['count'])
     
-    def test_vendor_detail_and_update(self, auth_headers):
+    def test_vendor_detail_and_update(self, http):
         """Test vendor detail retrieval and update"""
         # Get first vendor
-        list_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors",
-            headers=auth_headers
-        )
+        list_response = http.get(f"{BASE_URL}/api/commerce/parties/vendors")
         assert list_response.status_code == 200
         vendors = list_response.json().get("vendors", [])
         assert len(vendors) > 0, "Should have at least one vendor"
@@ -235,64 +217,44 @@ class TestVendorsListFeatures:
         vendor_id = vendors[0]["vendor_id"]
         
         # Get vendor detail
-        detail_response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors/{vendor_id}",
-            headers=auth_headers
-        )
+        detail_response = http.get(f"{BASE_URL}/api/commerce/parties/vendors/{vendor_id}")
         assert detail_response.status_code == 200, f"Failed to get vendor detail: {detail_response.text}"
         data = detail_response.json()
         assert data.get("success") == True
         assert "vendor" in data
-        print(f"Vendor detail retrieved: {data['vendor']['display_name']}")
+        logger.info("Vendor detail retrieved: %s", data['vendor']['display_name'])
 
 
+@pytest.mark.xdist_group("parties_bulk")
 class TestCleanupBulkData:
     """Cleanup bulk test data"""
     
-    @pytest.fixture(scope="class")
-    def auth_headers(self):
-        """Get auth headers for requests"""
-        response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            token = data.get("access_token") or data.get("token")
-            return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        pytest.skip("Authentication failed")
-    
-    def test_cleanup_bulk_customers(self, auth_headers):
-        """Clean up TEST_Bulk_ prefixed customers"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/customers?search=TEST_Bulk_",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            customers = response.json().get("customers", [])
-            for customer in customers:
-                if customer.get("display_name", "").startswith("TEST_Bulk_"):
-                    requests.delete(
-                        f"{BASE_URL}/api/commerce/parties/customers/{customer['customer_id']}",
-                        headers=auth_headers
-                    )
-                    print(f"Deleted test customer: {customer['customer_id']}")
-    
-    def test_cleanup_bulk_vendors(self, auth_headers):
-        """Clean up TEST_Bulk_ prefixed vendors"""
-        response = requests.get(
-            f"{BASE_URL}/api/commerce/parties/vendors?search=TEST_Bulk_",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            vendors = response.json().get("vendors", [])
-            for vendor in vendors:
-                if vendor.get("display_name", "").startswith("TEST_Bulk_"):
-                    requests.delete(
-                        f"{BASE_URL}/api/commerce/parties/vendors/{vendor['vendor_id']}",
-                        headers=auth_headers
-                    )
-                    print(f"Deleted test vendor: {vendor['vendor_id']}")
+    def test_cleanup_bulk_parties(self, http, parallel, created_ids):
+        """Clean up the customers and vendors test_bulk_create made, plus any
+        BULK_PREFIX leftovers, one bulk delete per party type, with both
+        types handled concurrently"""
+        def sweep(party_type):
+            response = http.get(f"{BASE_URL}/api/commerce/parties/{party_type}", params={"prefix": BULK_PREFIX})
+            assert response.status_code == 200, f"Listing {party_type} failed: {response.text}"
+            id_field = f"{party_type[:-1]}_id"
+            listed = [party[id_field] for party in response.json().get(party_type, [])]
+            # The listing normally includes the returned ids; they are merged
+            # in anyway, since a failed query still answers 200 with no parties
+            party_ids = list(dict.fromkeys(created_ids[party_type] + listed))
+            if not party_ids:
+                return party_ids, None
+            return party_ids, http.delete(
+                f"{BASE_URL}/api/commerce/parties/bulk/delete",
+                params={"party_type": party_type},
+                json=party_ids
+            )
+        
+        for party_type, (party_ids, response) in zip(created_ids, parallel(sweep, created_ids)):
+            if response is None:
+                continue
+            assert response.status_code == 200, f"Bulk delete failed: {response.text}"
+            assert response.json()["deleted_count"] == len(party_ids)
+            logger.info("Deleted test %s: %s", party_type, party_ids)
 
 
 if __name__ == "__main__":
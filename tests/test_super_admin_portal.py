@@ -1,90 +1,184 @@
 """
 Super Admin Portal - Backend API Tests
 Tests: Authentication, Dashboard, Organizations CRUD, Users CRUD
+
+The super admin logs in once per pytest session (once per xdist worker):
+the session-scoped super_admin_token and super_admin_http fixtures live in
+conftest.py, so the token is shared by every module that needs it.
+
+The classes are independent and network-bound, so they can spread across
+pytest-xdist workers. Each CRUD class is one group, kept on one worker.
+The organizations and users they need are created up front by the
+module-scoped precreated fixture, once per worker that runs either class
+(TEST_ names carry a uuid, so workers never collide on them):
+    pytest -n auto --dist=loadgroup tests/test_super_admin_portal.py
+
+Every test reaches the backend through the conftest.py transport, which
+probes REACT_APP_BACKEND_URL once per session (the live_backend fixture):
+if it is unreachable the whole module is skipped after one short timeout.
 """
 import pytest
-import requests
+import json
+import logging
 import os
 import uuid
 
-BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://saas-finint.preview.emergentagent.com').rstrip('/')
+from tests.conftest import SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Progress is logged at INFO; run with --log-cli-level=INFO to see it
+logger = logging.getLogger(__name__)
 
-# Super Admin Credentials
-SUPER_ADMIN_EMAIL = "revanth@innovatebooks.in"
-SUPER_ADMIN_PASSWORD = "Pandu@1605"
+# Super admin endpoints that must reject requests without a token
+AUTH_REQUIRED_PATHS = ["dashboard", "organizations", "users"]
+
+
+def encode_json(payload):
+    """Request body bytes, encoded with orjson when it is installed; the
+    super admin session already sends Content-Type: application/json"""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+
+
+def ok_json(response, action):
+    """Fail with the status and body unless the response is a 200, else
+    return the parsed body; action names the call in the failure message"""
+    if response.status_code != 200:
+        pytest.fail(f"{action} failed: {response.status_code} {response.text}")
+    return response.json()
 
 
 class TestSuperAdminAuth:
     """Test Super Admin Authentication via Enterprise Auth"""
     
-    def test_login_success(self):
+    def test_login_success(self, http_unauth):
         """Test successful super admin login"""
-        response = requests.post(
+        response = http_unauth.post(
             f"{BASE_URL}/api/enterprise/auth/login",
             json={"email": SUPER_ADMIN_EMAIL, "password": SUPER_ADMIN_PASSWORD}
         )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        data = response.json()
+        data = ok_json(response, "Login")
         assert data.get("success") == True
         assert "access_token" in data
         assert "refresh_token" in data
         assert data.get("user", {}).get("is_super_admin") == True
-        print(f"✅ Super Admin login successful - user_id: {data['user']['user_id']}")
+        logger.info("✅ Super Admin login successful - user_id: %s", data['user']['user_id'])
     
-    def test_login_invalid_password(self):
+    def test_login_invalid_password(self, http_unauth):
         """Test login with invalid password"""
-        response = requests.post(
+        response = http_unauth.post(
             f"{BASE_URL}/api/enterprise/auth/login",
             json={"email": SUPER_ADMIN_EMAIL, "password": "wrongpassword"}
         )
         assert response.status_code == 401, f"Expected 401, got {response.status_code}"
-        print("✅ Invalid password correctly rejected")
+        logger.info("✅ Invalid password correctly rejected")
     
-    def test_login_invalid_email(self):
+    def test_login_invalid_email(self, http_unauth):
         """Test login with non-existent email"""
-        response = requests.post(
+        response = http_unauth.post(
             f"{BASE_URL}/api/enterprise/auth/login",
             json={"email": "nonexistent@test.com", "password": "anypassword"}
         )
         assert response.status_code == 401, f"Expected 401, got {response.status_code}"
-        print("✅ Non-existent email correctly rejected")
+        logger.info("✅ Non-existent email correctly rejected")
 
 
 @pytest.fixture(scope="module")
-def auth_token():
-    """Get authentication token for super admin"""
-    response = requests.post(
-        f"{BASE_URL}/api/enterprise/auth/login",
-        json={"email": SUPER_ADMIN_EMAIL, "password": SUPER_ADMIN_PASSWORD}
-    )
-    if response.status_code != 200:
-        pytest.skip(f"Authentication failed: {response.text}")
-    return response.json()["access_token"]
+def http(super_admin_http):
+    """Super admin session, logged in once per session by conftest.py"""
+    return super_admin_http
+
+
+def org_payload(prefix, **fields):
+    """Body for a TEST_<prefix>_<uuid> organization, with fields added"""
+    unique_id = uuid.uuid4().hex[:6]
+    return {"name": f"TEST_{prefix}_{unique_id}", "display_name": f"{prefix.capitalize()} Test {unique_id}", **fields}
+
+
+def user_payload(prefix, org_id, **fields):
+    """Body for a TEST_<prefix>_<uuid>@test.com user in org_id, with fields added"""
+    unique_id = uuid.uuid4().hex[:6]
+    return {
+        "email": f"TEST_{prefix}_{unique_id}@test.com",
+        "password": "TestPass123!",
+        "first_name": prefix.capitalize(),
+        "last_name": "Test",
+        "role": "user",
+        "org_id": org_id,
+        **fields
+    }
+
+
+@pytest.fixture(scope="module")
+def make_org(http):
+    """Factory: make_org(prefix, **fields) creates an organization from
+    org_payload and returns it"""
+    def make(prefix, **fields):
+        response = http.post(f"{BASE_URL}/api/super-admin/organizations", data=encode_json(org_payload(prefix, **fields)))
+        return ok_json(response, "Create org")["organization"]
+    return make
+
+
+@pytest.fixture(scope="module")
+def make_user(http):
+    """Factory: make_user(prefix, org_id, **fields) creates a user from
+    user_payload and returns it"""
+    def make(prefix, org_id, **fields):
+        response = http.post(f"{BASE_URL}/api/super-admin/users", data=encode_json(user_payload(prefix, org_id, **fields)))
+        return ok_json(response, "Create user")["user"]
+    return make
+
+
+# Organizations created up front, by key, with their extra fields: "shared"
+# is read and updated by the detail and update tests and lends its name to
+# the duplicate-name test, "deactivate" is kept apart because deactivation
+# can't be undone, "user_org" holds the users
+PRECREATED_ORGS = {"shared": {}, "deactivate": {}, "user_org": {"max_users": 20}}
+# Users created up front in "user_org", for the update and deactivate tests;
+# the duplicate-email test reuses the "update" user's email
+PRECREATED_USERS = ("update", "deactivate")
+
+
+@pytest.fixture(scope="module")
+def precreated(make_org, make_user, parallel):
+    """Create every organization and user the CRUD tests need up front, in
+    two concurrent batches: the organizations, then the users that need
+    the "user_org" id; returns {"orgs": {key: org}, "users": {key: user}}"""
+    orgs = dict(zip(PRECREATED_ORGS, parallel(lambda key: make_org(key, **PRECREATED_ORGS[key]), PRECREATED_ORGS)))
+    users = parallel(lambda key: make_user(key, orgs["user_org"]["org_id"]), PRECREATED_USERS)
+    return {"orgs": orgs, "users": dict(zip(PRECREATED_USERS, users))}
+
+
+@pytest.fixture(scope="module")
+def precreated_orgs(precreated):
+    """Up-front organizations, keyed like PRECREATED_ORGS"""
+    return precreated["orgs"]
+
+
+@pytest.fixture(scope="module")
+def test_org_id(precreated):
+    """Test organization for user tests"""
+    return precreated["orgs"]["user_org"]["org_id"]
 
 
 @pytest.fixture(scope="module")
-def auth_headers(auth_token):
-    """Get headers with auth token"""
-    return {"Authorization": f"Bearer {auth_token}", "Content-Type": "application/json"}
+def precreated_users(precreated):
+    """Up-front users, keyed like PRECREATED_USERS"""
+    return precreated["users"]
 
 
 class TestSuperAdminDashboard:
     """Test Super Admin Dashboard API"""
     
-    def test_dashboard_without_auth(self):
-        """Test dashboard access without authentication"""
-        response = requests.get(f"{BASE_URL}/api/super-admin/dashboard")
-        assert response.status_code in [401, 403], f"Expected 401/403, got {response.status_code}"
-        print("✅ Dashboard correctly requires authentication")
-    
-    def test_dashboard_with_auth(self, auth_headers):
+    def test_dashboard_with_auth(self, http):
         """Test dashboard access with valid token"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/dashboard",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Dashboard failed: {response.text}"
-        data = response.json()
+        response = http.get(f"{BASE_URL}/api/super-admin/dashboard")
+        data = ok_json(response, "Dashboard")
         
         # Verify stats structure
         assert "stats" in data, "Missing stats in response"
@@ -101,118 +195,71 @@ class TestSuperAdminDashboard:
         assert "recent_organizations" in data
         assert "recent_users" in data
         
-        print(f"✅ Dashboard loaded - Orgs: {stats['total_organizations']}, Users: {stats['total_users']}")
+        logger.info("✅ Dashboard loaded - Orgs: %s, Users: %s", stats['total_organizations'], stats['total_users'])
 
 
+@pytest.mark.xdist_group("super_admin_orgs")
 class TestOrganizationsCRUD:
     """Test Organizations CRUD operations"""
     
-    def test_list_organizations_without_auth(self):
-        """Test listing organizations without authentication"""
-        response = requests.get(f"{BASE_URL}/api/super-admin/organizations")
-        assert response.status_code in [401, 403], f"Expected 401/403, got {response.status_code}"
-        print("✅ Organizations list correctly requires authentication")
-    
-    def test_list_organizations(self, auth_headers):
+    def test_list_organizations(self, http):
         """Test listing all organizations"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"List orgs failed: {response.text}"
-        data = response.json()
+        response = http.get(f"{BASE_URL}/api/super-admin/organizations")
+        data = ok_json(response, "List orgs")
         assert "organizations" in data
         assert isinstance(data["organizations"], list)
-        print(f"✅ Listed {len(data['organizations'])} organizations")
+        logger.info("✅ Listed %s organizations", len(data['organizations']))
     
-    def test_create_organization(self, auth_headers):
+    def test_create_organization(self, http):
         """Test creating a new organization"""
-        unique_id = uuid.uuid4().hex[:6]
-        org_data = {
-            "name": f"TEST_org_{unique_id}",
-            "display_name": f"Test Organization {unique_id}",
-            "industry": "technology",
-            "size": "medium",
-            "subscription_plan": "professional",
-            "max_users": 10,
-            "features": ["finance", "commerce"]
-        }
+        org_data = org_payload(
+            "org",
+            industry="technology",
+            size="medium",
+            subscription_plan="professional",
+            max_users=10,
+            features=["finance", "commerce"]
+        )
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json=org_data
+            data=encode_json(org_data)
         )
-        assert response.status_code == 200, f"Create org failed: {response.text}"
-        data = response.json()
+        data = ok_json(response, "Create org")
         assert data.get("success") == True
         assert "organization" in data
         org = data["organization"]
         assert org["name"] == org_data["name"]
         assert org["display_name"] == org_data["display_name"]
         assert "org_id" in org
-        print(f"✅ Created organization: {org['org_id']}")
+        logger.info("✅ Created organization: %s", org['org_id'])
         return org["org_id"]
     
-    def test_create_duplicate_organization(self, auth_headers):
+    def test_create_duplicate_organization(self, http, precreated_orgs):
         """Test creating organization with duplicate name"""
-        # First create an org
-        unique_id = uuid.uuid4().hex[:6]
-        org_data = {
-            "name": f"TEST_dup_{unique_id}",
-            "display_name": f"Duplicate Test {unique_id}"
-        }
-        
-        response1 = requests.post(
+        # Reuse the name of an organization created up front
+        response = http.post(
             f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json=org_data
+            data=encode_json(org_payload("dup", name=precreated_orgs["shared"]["name"]))
         )
-        assert response1.status_code == 200
-        
-        # Try to create with same name
-        response2 = requests.post(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json=org_data
-        )
-        assert response2.status_code == 400, f"Expected 400 for duplicate, got {response2.status_code}"
-        print("✅ Duplicate organization name correctly rejected")
+        assert response.status_code == 400, f"Expected 400 for duplicate, got {response.status_code}"
+        logger.info("✅ Duplicate organization name correctly rejected")
     
-    def test_get_organization_detail(self, auth_headers):
+    def test_get_organization_detail(self, http, precreated_orgs):
         """Test getting organization details"""
-        # First create an org
-        unique_id = uuid.uuid4().hex[:6]
-        create_response = requests.post(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json={"name": f"TEST_detail_{unique_id}", "display_name": f"Detail Test {unique_id}"}
-        )
-        assert create_response.status_code == 200
-        org_id = create_response.json()["organization"]["org_id"]
+        org_id = precreated_orgs["shared"]["org_id"]
         
         # Get details
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/organizations/{org_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Get org detail failed: {response.text}"
-        data = response.json()
+        response = http.get(f"{BASE_URL}/api/super-admin/organizations/{org_id}")
+        data = ok_json(response, "Get org detail")
         assert data["org_id"] == org_id
         assert "stats" in data
-        print(f"✅ Got organization detail for: {org_id}")
+        logger.info("✅ Got organization detail for: %s", org_id)
     
-    def test_update_organization(self, auth_headers):
+    def test_update_organization(self, http, precreated_orgs):
         """Test updating an organization"""
-        # First create an org
+        org_id = precreated_orgs["shared"]["org_id"]
         unique_id = uuid.uuid4().hex[:6]
-        create_response = requests.post(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json={"name": f"TEST_update_{unique_id}", "display_name": f"Update Test {unique_id}"}
-        )
-        assert create_response.status_code == 200
-        org_id = create_response.json()["organization"]["org_id"]
         
         # Update
         update_data = {
@@ -220,117 +267,61 @@ class TestOrganizationsCRUD:
             "subscription_plan": "enterprise",
             "max_users": 50
         }
-        response = requests.put(
+        response = http.put(
             f"{BASE_URL}/api/super-admin/organizations/{org_id}",
-            headers=auth_headers,
-            json=update_data
+            data=encode_json(update_data)
         )
-        assert response.status_code == 200, f"Update org failed: {response.text}"
-        data = response.json()
+        data = ok_json(response, "Update org")
         assert data.get("success") == True
         assert data["organization"]["display_name"] == update_data["display_name"]
         assert data["organization"]["subscription_plan"] == "enterprise"
-        print(f"✅ Updated organization: {org_id}")
+        logger.info("✅ Updated organization: %s", org_id)
     
-    def test_deactivate_organization(self, auth_headers):
+    def test_deactivate_organization(self, http, precreated_orgs):
         """Test deactivating an organization"""
-        # First create an org
-        unique_id = uuid.uuid4().hex[:6]
-        create_response = requests.post(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json={"name": f"TEST_deactivate_{unique_id}", "display_name": f"Deactivate Test {unique_id}"}
-        )
-        assert create_response.status_code == 200
-        org_id = create_response.json()["organization"]["org_id"]
+        org_id = precreated_orgs["deactivate"]["org_id"]
         
         # Deactivate
-        response = requests.delete(
-            f"{BASE_URL}/api/super-admin/organizations/{org_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Deactivate org failed: {response.text}"
-        data = response.json()
+        response = http.delete(f"{BASE_URL}/api/super-admin/organizations/{org_id}")
+        data = ok_json(response, "Deactivate org")
         assert data.get("success") == True
-        print(f"✅ Deactivated organization: {org_id}")
+        logger.info("✅ Deactivated organization: %s", org_id)
     
-    def test_get_nonexistent_organization(self, auth_headers):
+    def test_get_nonexistent_organization(self, http):
         """Test getting non-existent organization"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/organizations/NONEXISTENT-ORG-ID",
-            headers=auth_headers
-        )
+        response = http.get(f"{BASE_URL}/api/super-admin/organizations/NONEXISTENT-ORG-ID")
         assert response.status_code == 404, f"Expected 404, got {response.status_code}"
-        print("✅ Non-existent organization correctly returns 404")
+        logger.info("✅ Non-existent organization correctly returns 404")
 
 
+@pytest.mark.xdist_group("super_admin_users")
 class TestUsersCRUD:
     """Test Users CRUD operations"""
     
-    @pytest.fixture(scope="class")
-    def test_org_id(self, auth_headers):
-        """Create a test organization for user tests"""
-        unique_id = uuid.uuid4().hex[:6]
-        response = requests.post(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers,
-            json={
-                "name": f"TEST_user_org_{unique_id}",
-                "display_name": f"User Test Org {unique_id}",
-                "max_users": 20
-            }
-        )
-        assert response.status_code == 200
-        return response.json()["organization"]["org_id"]
-    
-    def test_list_users_without_auth(self):
-        """Test listing users without authentication"""
-        response = requests.get(f"{BASE_URL}/api/super-admin/users")
-        assert response.status_code in [401, 403], f"Expected 401/403, got {response.status_code}"
-        print("✅ Users list correctly requires authentication")
-    
-    def test_list_users(self, auth_headers):
+    def test_list_users(self, http):
         """Test listing all users"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"List users failed: {response.text}"
-        data = response.json()
+        response = http.get(f"{BASE_URL}/api/super-admin/users")
+        data = ok_json(response, "List users")
         assert "users" in data
         assert isinstance(data["users"], list)
-        print(f"✅ Listed {len(data['users'])} users")
+        logger.info("✅ Listed %s users", len(data['users']))
     
-    def test_list_users_by_org(self, auth_headers, test_org_id):
+    def test_list_users_by_org(self, http, test_org_id):
         """Test listing users filtered by organization"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/users?org_id={test_org_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"List users by org failed: {response.text}"
-        data = response.json()
+        response = http.get(f"{BASE_URL}/api/super-admin/users?org_id={test_org_id}")
+        data = ok_json(response, "List users by org")
         assert "users" in data
-        print(f"✅ Listed users for org {test_org_id}")
+        logger.info("✅ Listed users for org %s", test_org_id)
     
-    def test_create_user(self, auth_headers, test_org_id):
+    def test_create_user(self, http, test_org_id):
         """Test creating a new user"""
-        unique_id = uuid.uuid4().hex[:6]
-        user_data = {
-            "email": f"TEST_user_{unique_id}@test.com",
-            "password": "TestPass123!",
-            "first_name": "Test",
-            "last_name": f"User {unique_id}",
-            "role": "user",
-            "org_id": test_org_id
-        }
+        user_data = user_payload("user", test_org_id)
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json=user_data
+            data=encode_json(user_data)
         )
-        assert response.status_code == 200, f"Create user failed: {response.text}"
-        data = response.json()
+        data = ok_json(response, "Create user")
         assert data.get("success") == True
         assert "user" in data
         user = data["user"]
@@ -338,76 +329,33 @@ class TestUsersCRUD:
         assert user["first_name"] == user_data["first_name"]
         assert "user_id" in user
         assert "password_hash" not in user  # Password should not be returned
-        print(f"✅ Created user: {user['user_id']}")
+        logger.info("✅ Created user: %s", user['user_id'])
         return user["user_id"]
     
-    def test_create_duplicate_user(self, auth_headers, test_org_id):
+    def test_create_duplicate_user(self, http, precreated_users, test_org_id):
         """Test creating user with duplicate email"""
-        unique_id = uuid.uuid4().hex[:6]
-        user_data = {
-            "email": f"TEST_dup_{unique_id}@test.com",
-            "password": "TestPass123!",
-            "first_name": "Duplicate",
-            "last_name": "Test",
-            "role": "user",
-            "org_id": test_org_id
-        }
-        
-        # Create first user
-        response1 = requests.post(
+        # Reuse the email of a user created up front; updates never change it
+        response = http.post(
             f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json=user_data
+            data=encode_json(user_payload("dup", test_org_id, email=precreated_users["update"]["email"]))
         )
-        assert response1.status_code == 200
-        
-        # Try to create with same email
-        response2 = requests.post(
-            f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json=user_data
-        )
-        assert response2.status_code == 400, f"Expected 400 for duplicate, got {response2.status_code}"
-        print("✅ Duplicate user email correctly rejected")
+        assert response.status_code == 400, f"Expected 400 for duplicate, got {response.status_code}"
+        logger.info("✅ Duplicate user email correctly rejected")
     
-    def test_create_user_invalid_org(self, auth_headers):
+    def test_create_user_invalid_org(self, http):
         """Test creating user with non-existent organization"""
-        unique_id = uuid.uuid4().hex[:6]
-        user_data = {
-            "email": f"TEST_invalid_org_{unique_id}@test.com",
-            "password": "TestPass123!",
-            "first_name": "Invalid",
-            "last_name": "Org",
-            "role": "user",
-            "org_id": "NONEXISTENT-ORG"
-        }
+        user_data = user_payload("invalid_org", "NONEXISTENT-ORG")
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json=user_data
+            data=encode_json(user_data)
         )
         assert response.status_code == 404, f"Expected 404, got {response.status_code}"
-        print("✅ User creation with invalid org correctly rejected")
+        logger.info("✅ User creation with invalid org correctly rejected")
     
-    def test_update_user(self, auth_headers, test_org_id):
+    def test_update_user(self, http, precreated_users):
         """Test updating a user"""
-        # First create a user
-        unique_id = uuid.uuid4().hex[:6]
-        create_response = requests.post(
-            f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json={
-                "email": f"TEST_update_{unique_id}@test.com",
-                "password": "TestPass123!",
-                "first_name": "Update",
-                "last_name": "Test",
-                "role": "user",
-                "org_id": test_org_id
-            }
-        )
-        assert create_response.status_code == 200
-        user_id = create_response.json()["user"]["user_id"]
+        user_id = precreated_users["update"]["user_id"]
         
         # Update
         update_data = {
@@ -415,73 +363,65 @@ class TestUsersCRUD:
             "last_name": "Name",
             "role": "manager"
         }
-        response = requests.put(
+        response = http.put(
             f"{BASE_URL}/api/super-admin/users/{user_id}",
-            headers=auth_headers,
-            json=update_data
+            data=encode_json(update_data)
         )
-        assert response.status_code == 200, f"Update user failed: {response.text}"
-        data = response.json()
+        data = ok_json(response, "Update user")
         assert data.get("success") == True
         assert data["user"]["first_name"] == "Updated"
         assert data["user"]["role"] == "manager"
-        print(f"✅ Updated user: {user_id}")
+        logger.info("✅ Updated user: %s", user_id)
     
-    def test_deactivate_user(self, auth_headers, test_org_id):
+    def test_deactivate_user(self, http, precreated_users):
         """Test deactivating a user"""
-        # First create a user
-        unique_id = uuid.uuid4().hex[:6]
-        create_response = requests.post(
-            f"{BASE_URL}/api/super-admin/users",
-            headers=auth_headers,
-            json={
-                "email": f"TEST_deactivate_{unique_id}@test.com",
-                "password": "TestPass123!",
-                "first_name": "Deactivate",
-                "last_name": "Test",
-                "role": "user",
-                "org_id": test_org_id
-            }
-        )
-        assert create_response.status_code == 200
-        user_id = create_response.json()["user"]["user_id"]
+        user_id = precreated_users["deactivate"]["user_id"]
         
         # Deactivate
-        response = requests.delete(
-            f"{BASE_URL}/api/super-admin/users/{user_id}",
-            headers=auth_headers
-        )
-        assert response.status_code == 200, f"Deactivate user failed: {response.text}"
-        data = response.json()
+        response = http.delete(f"{BASE_URL}/api/super-admin/users/{user_id}")
+        data = ok_json(response, "Deactivate user")
         assert data.get("success") == True
-        print(f"✅ Deactivated user: {user_id}")
+        logger.info("✅ Deactivated user: %s", user_id)
     
-    def test_update_nonexistent_user(self, auth_headers):
+    def test_update_nonexistent_user(self, http):
         """Test updating non-existent user"""
-        response = requests.put(
+        response = http.put(
             f"{BASE_URL}/api/super-admin/users/NONEXISTENT-USER-ID",
-            headers=auth_headers,
-            json={"first_name": "Test"}
+            data=encode_json({"first_name": "Test"})
         )
         assert response.status_code == 404, f"Expected 404, got {response.status_code}"
-        print("✅ Non-existent user update correctly returns 404")
+        logger.info("✅ Non-existent user update correctly returns 404")
+
+
+@pytest.mark.parametrize("path", AUTH_REQUIRED_PATHS)
+def test_requires_auth(http_unauth, path):
+    """Test super admin endpoints reject requests without a token"""
+    response = http_unauth.get(f"{BASE_URL}/api/super-admin/{path}")
+    assert response.status_code in [401, 403], f"Expected 401/403 for {path}, got {response.status_code}"
 
 
 class TestCleanup:
     """Cleanup test data"""
     
-    def test_cleanup_test_organizations(self, auth_headers):
-        """List and report test organizations for cleanup"""
-        response = requests.get(
-            f"{BASE_URL}/api/super-admin/organizations",
-            headers=auth_headers
-        )
-        if response.status_code == 200:
-            orgs = response.json().get("organizations", [])
-            test_orgs = [o for o in orgs if o.get("name", "").startswith("TEST_")]
-            print(f"ℹ️ Found {len(test_orgs)} test organizations (TEST_ prefix)")
-            for org in test_orgs[:5]:  # Show first 5
-                print(f"   - {org.get('name')} ({org.get('org_id')})")
+    def test_cleanup_test_organizations(self, request, http, parallel):
+        """List the TEST_ organizations for cleanup, and with
+        --deactivate-test-orgs deactivate the active ones concurrently"""
+        response = http.get(f"{BASE_URL}/api/super-admin/organizations", params={"prefix": "TEST_"})
+        test_orgs = ok_json(response, "List orgs").get("organizations", [])
+        logger.info("ℹ️ Found %s test organizations (TEST_ prefix)", len(test_orgs))
+        for org in test_orgs[:5]:  # Show first 5
+            logger.info("   - %s (%s)", org.get('name'), org.get('org_id'))
+        
+        if not request.config.getoption("--deactivate-test-orgs"):
+            return
+        # Other workers may still be using their TEST_ organizations
+        if os.environ.get("PYTEST_XDIST_WORKER"):
+            pytest.skip("--deactivate-test-orgs needs a run without pytest-xdist")
+        active = [org["org_id"] for org in test_orgs if org.get("is_active")]
+        responses = parallel(lambda org_id: http.delete(f"{BASE_URL}/api/super-admin/organizations/{org_id}"), active)
+        for org_id, response in zip(active, responses):
+            ok_json(response, f"Deactivate org {org_id}")
+        logger.info("✅ Deactivated %s test organizations", len(active))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""
+In-process fixtures for validation-only tests
+Routers are mounted on a bare FastAPI app and exercised through TestClient,
+so these tests need neither a running backend nor a network connection.
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Routers read the signing key at import time
+os.environ.setdefault("JWT_SECRET_KEY", "unit-test-secret")
+
+import cap_table_scenario_routes  # noqa: E402
+import ml_reconciliation_routes  # noqa: E402
+
+# Authenticated user injected in place of JWT decoding
+TEST_USER = {"user_id": "TEST-USER", "org_id": "TEST-ORG"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient over the routers under test, with auth overridden"""
+    app = FastAPI()
+    for module in (cap_table_scenario_routes, ml_reconciliation_routes):
+        app.include_router(module.router)
+        app.dependency_overrides[module.get_current_user] = lambda: TEST_USER
+    with TestClient(app) as test_client:
+        yield test_client
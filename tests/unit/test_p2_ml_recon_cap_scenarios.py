@@ -0,0 +1,41 @@
+"""
+Test P2 Features: request validation for ML Bank Reconciliation and Cap Table
+Scenario Modeling, run in-process against the routers
+"""
+
+import ml_reconciliation_routes
+
+
+class TestMLBankReconciliationValidation:
+    """Test ML reconciliation request validation"""
+
+    def test_ml_confirm_match_requires_ids(self, client, monkeypatch):
+        """Test POST /api/ib-finance/ml-reconcile/confirm-match requires bank_entry_id and accounting_record_id"""
+        # Validation fails before the database is touched
+        monkeypatch.setattr(ml_reconciliation_routes, "get_db", lambda: None)
+        response = client.post("/api/ib-finance/ml-reconcile/confirm-match", json={})
+        assert response.status_code == 400, f"Expected 400 for missing fields, got {response.status_code}"
+
+
+class TestCapTableScenarioValidation:
+    """Test Cap Table Scenario Modeling request validation"""
+
+    def test_create_scenario_requires_name(self, client):
+        """Test scenario creation requires name"""
+        response = client.post("/api/ib-capital/scenario/create", json={
+            "description": "Test without name",
+            "base_valuation": 10000000,
+            "base_shares_outstanding": 10000000
+        })
+        assert response.status_code in [400, 422], f"Expected 400/422, got {response.status_code}"
+
+    def test_quick_simulation_requires_positive_investment(self, client):
+        """Test quick simulation validates investment amount"""
+        response = client.post("/api/ib-capital/scenario/simulate-quick", json={
+            "current_shares": 10000000,
+            "current_valuation": 10000000,
+            "pre_money_valuation": 10000000,
+            "investment_amount": 0,  # Invalid
+            "option_pool_increase": 0
+        })
+        assert response.status_code == 400, f"Expected 400 for zero investment, got {response.status_code}"